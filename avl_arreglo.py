@@ -0,0 +1,273 @@
+from __future__ import annotations
+from array import array
+from typing import List, Optional
+
+from main import Evento, RegistroEvento, formatear_evento
+
+# Backend alternativo de AVLTree para grandes volúmenes de claves enteras.
+#
+# En lugar de un objeto Nodo por clave, los campos viven en columnas
+# paralelas de arrays tipados, indexadas por el número de nodo:
+#   _clave[i]  (int64)   _izq[i] / _der[i]  (int32, índices)   _altura[i]  (int8)
+# El índice 0 es el centinela "nulo": altura 0 y sin hijos, de modo que
+# altura(hijo) nunca necesita chequear None. Los nodos liberados se encadenan
+# en una lista libre (reusando la columna _izq) y se reutilizan al insertar.
+#
+# Mismas convenciones que main.py: altura(vacío) = 0, altura(hoja) = 1,
+# FB(n) = altura(der) - altura(izq).
+
+NULO = 0
+
+
+class AVLTreeArreglo:
+    """AVL de claves int con nodos en arrays tipados (misma interfaz básica que AVLTree)."""
+
+    def __init__(self, registrar_log: bool = True) -> None:
+        self._clave = array("q", [0])
+        self._izq = array("i", [NULO])
+        self._der = array("i", [NULO])
+        self._altura = array("b", [0])
+        self._libre = NULO  # cabeza de la lista libre
+        self.raiz = NULO
+        self._log: Optional[List[RegistroEvento]] = [] if registrar_log else None
+
+    # -------- Gestión de nodos --------
+    def _nuevo_nodo(self, clave: int) -> int:
+        i = self._libre
+        if i != NULO:
+            self._clave[i] = clave  # primero: si la clave no entra en int64, la lista libre queda intacta
+            self._libre = self._izq[i]
+            self._izq[i] = NULO
+            self._der[i] = NULO
+            self._altura[i] = 1
+            return i
+        self._clave.append(clave)
+        self._izq.append(NULO)
+        self._der.append(NULO)
+        self._altura.append(1)
+        return len(self._clave) - 1
+
+    def _liberar_nodo(self, i: int) -> None:
+        self._izq[i] = self._libre
+        self._der[i] = NULO
+        self._altura[i] = 0
+        self._libre = i
+
+    # -------- Utilitarios de altura / FB --------
+    def fb_estatico(self, i: int) -> int:
+        return self._altura[self._der[i]] - self._altura[self._izq[i]]
+
+    def _actualizar_altura(self, i: int) -> None:
+        h_izq = self._altura[self._izq[i]]
+        h_der = self._altura[self._der[i]]
+        self._altura[i] = 1 + (h_izq if h_izq > h_der else h_der)
+
+    # -------- Rotaciones --------
+    def _rotacion_der(self, a: int) -> int:
+        """Rotación simple a la derecha (caso LL)."""
+        izq, der = self._izq, self._der
+        b = izq[a]
+        izq[a] = der[b]
+        der[b] = a
+        self._actualizar_altura(a)
+        self._actualizar_altura(b)
+        return b
+
+    def _rotacion_izq(self, a: int) -> int:
+        """Rotación simple a la izquierda (caso RR)."""
+        izq, der = self._izq, self._der
+        c = der[a]
+        der[a] = izq[c]
+        izq[c] = a
+        self._actualizar_altura(a)
+        self._actualizar_altura(c)
+        return c
+
+    # -------- Inserción con reequilibrado --------
+    def insertar(self, clave: int) -> bool:
+        """Inserta 'clave' y reequilibra si es necesario (mismo algoritmo que AVLTree.insertar).
+
+        Retorna False si ya estaba.
+        """
+        if self._log is not None:
+            self._log.clear()
+        if self.raiz == NULO:
+            self.raiz = self._nuevo_nodo(clave)
+            return True
+
+        claves, izq, der, altura = self._clave, self._izq, self._der, self._altura
+        camino: List[int] = []
+        i = self.raiz
+        while i != NULO:
+            camino.append(i)
+            c = claves[i]
+            if clave < c:
+                i = izq[i]
+            elif clave > c:
+                i = der[i]
+            else:
+                if self._log is not None:
+                    self._log.append((Evento.DUPLICADA, clave, 0, None))
+                return False
+
+        nuevo = self._nuevo_nodo(clave)
+        padre = camino[-1]
+        if clave < claves[padre]:
+            izq[padre] = nuevo
+        else:
+            der[padre] = nuevo
+
+        for k in range(len(camino) - 1, -1, -1):
+            i = camino[k]
+            h_izq = altura[izq[i]]
+            h_der = altura[der[i]]
+            nueva_altura = 1 + (h_izq if h_izq > h_der else h_der)
+            if nueva_altura == altura[i]:
+                return True
+            altura[i] = nueva_altura
+
+            fb = h_der - h_izq
+            if -1 <= fb <= 1:
+                continue
+
+            nueva_raiz = self._reequilibrar(i, fb)
+            if k == 0:
+                self.raiz = nueva_raiz
+            elif izq[camino[k - 1]] == i:
+                izq[camino[k - 1]] = nueva_raiz
+            else:
+                der[camino[k - 1]] = nueva_raiz
+            return True
+        return True
+
+    def _reequilibrar(self, i: int, fb: int) -> int:
+        """Aplica la rotación que corresponda a 'i' (|FB| = 2) y retorna la nueva raíz del subárbol."""
+        claves = self._clave
+        if fb < -1:
+            hijo = self._izq[i]
+            if self.fb_estatico(hijo) <= 0:
+                if self._log is not None:
+                    self._log.append((Evento.LL, claves[i], fb, None))
+                return self._rotacion_der(i)
+            if self._log is not None:
+                self._log.append((Evento.LR, claves[i], fb, claves[hijo]))
+            self._izq[i] = self._rotacion_izq(hijo)
+            return self._rotacion_der(i)
+
+        hijo = self._der[i]
+        if self.fb_estatico(hijo) >= 0:
+            if self._log is not None:
+                self._log.append((Evento.RR, claves[i], fb, None))
+            return self._rotacion_izq(i)
+        if self._log is not None:
+            self._log.append((Evento.RL, claves[i], fb, claves[hijo]))
+        self._der[i] = self._rotacion_der(hijo)
+        return self._rotacion_izq(i)
+
+    # -------- Eliminación con reequilibrado --------
+    def eliminar(self, clave: int) -> bool:
+        """Elimina 'clave' y reequilibra si es necesario; el nodo liberado vuelve a la lista libre."""
+        if self._log is not None:
+            self._log.clear()
+        claves, izq, der, altura = self._clave, self._izq, self._der, self._altura
+        camino: List[int] = []
+        i = self.raiz
+        while i != NULO:
+            c = claves[i]
+            if clave < c:
+                camino.append(i)
+                i = izq[i]
+            elif clave > c:
+                camino.append(i)
+                i = der[i]
+            else:
+                break
+        if i == NULO:
+            if self._log is not None:
+                self._log.append((Evento.NO_ENCONTRADA, clave, 0, None))
+            return False
+
+        if izq[i] != NULO and der[i] != NULO:
+            camino.append(i)
+            sucesor = der[i]
+            while izq[sucesor] != NULO:
+                camino.append(sucesor)
+                sucesor = izq[sucesor]
+            claves[i] = claves[sucesor]
+            i = sucesor
+
+        reemplazo = izq[i] if izq[i] != NULO else der[i]
+        self._liberar_nodo(i)
+        if not camino:
+            self.raiz = reemplazo
+            return True
+        padre = camino[-1]
+        if izq[padre] == i:
+            izq[padre] = reemplazo
+        else:
+            der[padre] = reemplazo
+
+        for k in range(len(camino) - 1, -1, -1):
+            i = camino[k]
+            h_izq = altura[izq[i]]
+            h_der = altura[der[i]]
+            altura_previa = altura[i]
+            altura[i] = 1 + (h_izq if h_izq > h_der else h_der)
+
+            fb = h_der - h_izq
+            if -1 <= fb <= 1:
+                if altura[i] == altura_previa:
+                    break
+                continue
+
+            nueva_raiz = self._reequilibrar(i, fb)
+            if k == 0:
+                self.raiz = nueva_raiz
+            elif izq[camino[k - 1]] == i:
+                izq[camino[k - 1]] = nueva_raiz
+            else:
+                der[camino[k - 1]] = nueva_raiz
+            if altura[nueva_raiz] == altura_previa:
+                break
+        return True
+
+    # -------- Visualización ASCII --------
+    def ascii_simple(self) -> str:
+        """Retorna string con el árbol en ASCII mostrando solo las claves."""
+        if self.raiz == NULO:
+            return "(árbol vacío)"
+        lineas: List[str] = []
+        self._render_ascii(self.raiz, "", True, lineas)
+        return "\n".join(lineas)
+
+    def _render_ascii(self, i: int, prefijo: str, es_izq: bool, out: List[str]) -> None:
+        if self._der[i] != NULO:
+            self._render_ascii(self._der[i], prefijo + ("│   " if es_izq else "    "), False, out)
+        out.append(prefijo + ("└── " if es_izq else "┌── ") + str(self._clave[i]))
+        if self._izq[i] != NULO:
+            self._render_ascii(self._izq[i], prefijo + ("    " if es_izq else "│   "), True, out)
+
+    # -------- Utilitarios --------
+    def consumir_log(self) -> List[str]:
+        return [formatear_evento(e) for e in self.consumir_eventos()]
+
+    def consumir_eventos(self) -> List[RegistroEvento]:
+        if not self._log:
+            return []
+        eventos = list(self._log)
+        self._log.clear()
+        return eventos
+
+    def recorrido_inorden(self) -> List[int]:
+        claves, izq, der = self._clave, self._izq, self._der
+        res: List[int] = []
+        pila: List[int] = []
+        i = self.raiz
+        while pila or i != NULO:
+            while i != NULO:
+                pila.append(i)
+                i = izq[i]
+            i = pila.pop()
+            res.append(claves[i])
+            i = der[i]
+        return res
@@ -0,0 +1,201 @@
+from __future__ import annotations
+from array import array
+import mmap
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from main import AVLTree, Nodo
+
+# Exportación "congelada" de un AVLTree para consultas de solo lectura desde disco.
+#
+# El archivo es una cabecera seguida de un registro de tamaño fijo por nodo:
+#   clave (int64)   izq (int32)   der (int32)   altura (int32)
+# izq/der son el número de registro del hijo (SIN_HIJO si no hay). Los nodos se
+# escriben en preorden, así que la raíz es siempre el registro 0.
+#
+# AVLCongelado abre el archivo con mmap y lee cada registro en el momento con
+# struct.unpack_from: no hay que deserializar nada al abrir, y varios procesos
+# que abren el mismo archivo comparten las páginas en la caché del sistema.
+
+_CABECERA = struct.Struct("<4sB3xQ")  # firma, versión, cantidad de registros
+_REGISTRO = struct.Struct("<qiii")
+_FIRMA = b"AVLC"
+_VERSION = 1
+SIN_HIJO = -1
+
+# Cantidad de registros que se arman en memoria antes de escribirlos al archivo.
+_REGISTROS_POR_BLOQUE = 1 << 16
+
+
+def congelar(arbol: AVLTree, ruta: str) -> None:
+    """Exporta 'arbol' a 'ruta' en el formato de registros fijos que lee AVLCongelado.
+
+    Solo admite claves enteras de 64 bits y árboles sin valores (ValueError si no).
+    Todo se valida antes de abrir 'ruta', así que un error no deja un archivo a medias.
+    """
+    # Primera pasada: número de registro de cada nodo, en preorden, y validación.
+    orden: List[Nodo] = []
+    claves = array("q")
+    indice: Dict[int, int] = {}
+    pila: List[Nodo] = [arbol.raiz] if arbol.raiz is not None else []
+    try:
+        while pila:
+            n = pila.pop()
+            if n.valor is not None:
+                raise ValueError("congelar() no exporta valores asociados ni elementos de key=.")
+            if n.cuenta != 1:
+                raise ValueError("congelar() no exporta claves con varias ocurrencias (multiconjunto).")
+            claves.append(n.clave)
+            indice[id(n)] = len(orden)
+            orden.append(n)
+            if n.der is not None:
+                pila.append(n.der)
+            if n.izq is not None:
+                pila.append(n.izq)
+    except (OverflowError, TypeError) as e:
+        raise ValueError("congelar() solo admite claves enteras de 64 bits.") from e
+
+    with open(ruta, "wb") as f:
+        f.write(_CABECERA.pack(_FIRMA, _VERSION, len(orden)))
+        bloque = bytearray(_REGISTRO.size * min(len(orden), _REGISTROS_POR_BLOQUE))
+        for inicio in range(0, len(orden), _REGISTROS_POR_BLOQUE):
+            parte = orden[inicio:inicio + _REGISTROS_POR_BLOQUE]
+            for i, n in enumerate(parte, inicio):
+                izq = indice[id(n.izq)] if n.izq is not None else SIN_HIJO
+                der = indice[id(n.der)] if n.der is not None else SIN_HIJO
+                _REGISTRO.pack_into(bloque, (i - inicio) * _REGISTRO.size, claves[i], izq, der, n.altura)
+            f.write(memoryview(bloque)[:len(parte) * _REGISTRO.size])
+
+
+class AVLCongelado:
+    """Árbol exportado con congelar(), consultado directamente sobre el archivo (mmap).
+
+    Misma interfaz de consulta que AVLTree: contiene / 'in', minimo, maximo,
+    piso, techo, rango e iteración en orden. Es de solo lectura.
+    """
+
+    def __init__(self, ruta: str) -> None:
+        with open(ruta, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # archivo vacío
+                raise ValueError(f"{ruta}: no es un árbol exportado con congelar().") from e
+        if len(self._mm) < _CABECERA.size:
+            self._mm.close()
+            raise ValueError(f"{ruta}: no es un árbol exportado con congelar().")
+        firma, version, cantidad = _CABECERA.unpack_from(self._mm, 0)
+        if firma != _FIRMA or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f"{ruta}: no es un árbol exportado con congelar().")
+        if len(self._mm) < _CABECERA.size + cantidad * _REGISTRO.size:
+            self._mm.close()
+            raise ValueError(f"{ruta}: archivo truncado.")
+        self._cantidad = cantidad
+        self.raiz = 0 if cantidad else SIN_HIJO
+
+    def _registro(self, i: int):
+        """(clave, izq, der, altura) del registro i."""
+        return _REGISTRO.unpack_from(self._mm, _CABECERA.size + i * _REGISTRO.size)
+
+    # -------- Ciclo de vida --------
+    def cerrar(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "AVLCongelado":
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def altura(self) -> int:
+        return self._registro(self.raiz)[3] if self.raiz != SIN_HIJO else 0
+
+    # -------- Consultas --------
+    def contiene(self, clave: int) -> bool:
+        """True si 'clave' está en el árbol, en O(log n) lecturas de registro."""
+        i = self.raiz
+        while i != SIN_HIJO:
+            c, izq, der, _ = self._registro(i)
+            if clave < c:
+                i = izq
+            elif clave > c:
+                i = der
+            else:
+                return True
+        return False
+
+    __contains__ = contiene
+
+    def minimo(self) -> Optional[int]:
+        """Menor clave, o None si el árbol está vacío."""
+        i, mejor = self.raiz, None
+        while i != SIN_HIJO:
+            mejor, i, _, _ = self._registro(i)
+        return mejor
+
+    def maximo(self) -> Optional[int]:
+        """Mayor clave, o None si el árbol está vacío."""
+        i, mejor = self.raiz, None
+        while i != SIN_HIJO:
+            mejor, _, i, _ = self._registro(i)
+        return mejor
+
+    def piso(self, clave: int) -> Optional[int]:
+        """Mayor clave <= 'clave', o None si no hay ninguna."""
+        i, mejor = self.raiz, None
+        while i != SIN_HIJO:
+            c, izq, der, _ = self._registro(i)
+            if clave < c:
+                i = izq
+            elif clave > c:
+                mejor = c
+                i = der
+            else:
+                return c
+        return mejor
+
+    def techo(self, clave: int) -> Optional[int]:
+        """Menor clave >= 'clave', o None si no hay ninguna."""
+        i, mejor = self.raiz, None
+        while i != SIN_HIJO:
+            c, izq, der, _ = self._registro(i)
+            if clave < c:
+                mejor = c
+                i = izq
+            elif clave > c:
+                i = der
+            else:
+                return c
+        return mejor
+
+    def rango(self, lo: int, hi: int) -> Iterator[int]:
+        """Genera en orden las claves c con lo <= c <= hi, en O(log n + k)."""
+        pila: List[Tuple[int, int, int, int]] = []
+        i = self.raiz
+        while i != SIN_HIJO:
+            registro = self._registro(i)
+            if registro[0] < lo:
+                i = registro[2]
+            else:
+                pila.append(registro)
+                i = registro[1]
+        while pila:
+            c, _, der, _ = pila.pop()
+            if c > hi:
+                return
+            yield c
+            i = der
+            while i != SIN_HIJO:
+                registro = self._registro(i)
+                pila.append(registro)
+                i = registro[1]
+
+    def __iter__(self) -> Iterator[int]:
+        """Todas las claves en orden."""
+        minimo, maximo = self.minimo(), self.maximo()
+        if minimo is None:
+            return iter(())
+        return self.rango(minimo, maximo)
@@ -1,9 +1,26 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import math
+from itertools import islice
 from typing import List, Tuple, Optional
 from main import AVLTree, Nodo
 
+# Cada cuántos pasos se guarda una raíz de referencia del historial.
+INTERVALO_CHECKPOINT = 64
+
+# Layout del árbol (en píxeles)
+SEPARACION_NODOS = 50  # distancia horizontal mínima entre centros de nodos del mismo nivel
+ALTO_NIVEL = 80        # distancia vertical entre niveles
+MARGEN = 50            # margen superior/izquierdo
+
+# Zoom y nivel de detalle
+ZOOM_MIN, ZOOM_MAX = 0.02, 3.0
+ZOOM_DETALLE = 0.5     # por debajo de este zoom se resumen los subárboles chicos en pantalla
+ANCHO_RESUMEN = 60     # ancho en pantalla (px) por debajo del cual un subárbol se resume
+
+# Panel de información: líneas (o claves) que muestra cada sección antes de "Mostrar más"
+LINEAS_INFO = 100
+
 class AVLVisualizer:
     def __init__(self, root):
         self.root = root
@@ -30,8 +47,28 @@ class AVLVisualizer:
         
         self.secuencia = self.secuencias_predefinidas["Secuencia Original"]
         self.paso_actual = 0
-        self.historial_arboles = []  # Guarda el estado del árbol en cada paso
-        self.historial_logs = []     # Guarda los logs de cada paso
+        # El historial se calcula a demanda (ver obtener_paso):
+        self.checkpoints = {0: None}  # paso -> raíz del árbol tras ese paso (cada INTERVALO_CHECKPOINT)
+        self.bloque_actual = None     # índice del bloque de pasos en caché
+        self.bloque_pasos = []        # [(raíz, logs)] de los pasos de ese bloque
+        
+        # Ítems del canvas, para redibujar solo lo que cambia entre pasos
+        self.items_nodos = {}         # clave -> (id óvalo, id texto)
+        self.items_conexiones = {}    # (clave padre, clave hijo) -> id línea
+        self.posiciones_dibujadas = {}  # clave -> (x, y) de lo que está en pantalla
+        self.item_vacio = None        # id del texto "Árbol vacío"
+        self.items_resumenes = {}     # clave raíz del subárbol resumido -> (id rectángulo, id texto)
+        
+        # Vista: layout del paso actual (se recalcula solo al cambiar de paso) y zoom
+        self.raiz_dibujada = None
+        self.layout = None            # (posiciones, extensiones) en coordenadas de mundo
+        self.zoom = 1.0
+        self.zoom_dibujado = 1.0      # zoom con el que se crearon los ítems actuales
+        self.render_pendiente = False
+        
+        # Panel de información: límites ampliados con "Mostrar más" (se reinician al cambiar de paso)
+        self.paso_info = None
+        self.limites_info = {}
         
         self.setup_ui()
         self.preparar_historial()
@@ -121,6 +158,17 @@ class AVLVisualizer:
                                       command=self.reiniciar)
         self.btn_reiniciar.pack(side=tk.LEFT, padx=5)
         
+        ttk.Label(btn_frame, text="Ir a paso:").pack(side=tk.LEFT, padx=(20, 5))
+        self.entry_ir_a = ttk.Entry(btn_frame, width=8)
+        self.entry_ir_a.pack(side=tk.LEFT)
+        self.entry_ir_a.bind('<Return>', lambda event: self.ir_a_paso_ingresado())
+        self.btn_ir_a = ttk.Button(btn_frame, text="Ir", command=self.ir_a_paso_ingresado, width=4)
+        self.btn_ir_a.pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(btn_frame, text="Zoom:").pack(side=tk.LEFT, padx=(20, 5))
+        ttk.Button(btn_frame, text="−", width=3, command=lambda: self.cambiar_zoom(1 / 1.25)).pack(side=tk.LEFT)
+        ttk.Button(btn_frame, text="+", width=3, command=lambda: self.cambiar_zoom(1.25)).pack(side=tk.LEFT, padx=(5, 0))
+        
         # Información del paso actual
         info_frame = ttk.Frame(control_frame)
         info_frame.pack(fill=tk.X, pady=(10, 0))
@@ -139,14 +187,59 @@ class AVLVisualizer:
         self.canvas = tk.Canvas(canvas_frame, bg='white', width=600, height=500)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=self.canvas.yview)
-        h_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        # Scrollbars (al desplazarse se redibuja solo la parte visible)
+        v_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=self.desplazar_y)
+        h_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=self.desplazar_x)
         self.canvas.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
         
         v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
         
+        # Rueda del mouse: desplaza (Shift = horizontal, Ctrl = zoom)
+        self.canvas.bind("<MouseWheel>", self.on_rueda)
+        self.canvas.bind("<Button-4>", self.on_rueda)
+        self.canvas.bind("<Button-5>", self.on_rueda)
+        self.canvas.bind("<Configure>", lambda event: self.programar_render())
+        
+    def desplazar_x(self, *args):
+        self.canvas.xview(*args)
+        self.programar_render()
+        
+    def desplazar_y(self, *args):
+        self.canvas.yview(*args)
+        self.programar_render()
+        
+    def on_rueda(self, event):
+        """Desplaza o hace zoom con la rueda del mouse."""
+        arriba = event.num == 4 or getattr(event, "delta", 0) > 0
+        if event.state & 0x0004:  # Ctrl
+            self.cambiar_zoom(1.25 if arriba else 1 / 1.25)
+        elif event.state & 0x0001:  # Shift
+            self.desplazar_x("scroll", -1 if arriba else 1, "units")
+        else:
+            self.desplazar_y("scroll", -1 if arriba else 1, "units")
+            
+    def cambiar_zoom(self, factor: float):
+        """Cambia el zoom manteniendo centrado el punto que se está mirando."""
+        nuevo = min(max(self.zoom * factor, ZOOM_MIN), ZOOM_MAX)
+        if nuevo == self.zoom:
+            return
+        ancho, alto = self.canvas.winfo_width(), self.canvas.winfo_height()
+        centro_x = (self.canvas.canvasx(0) + ancho / 2) / self.zoom
+        centro_y = (self.canvas.canvasy(0) + alto / 2) / self.zoom
+        self.zoom = nuevo
+        if self.layout is not None:
+            x0, y0, x1, y1 = self.ajustar_scroll()
+            self.canvas.xview_moveto((centro_x * nuevo - ancho / 2 - x0) / max(x1 - x0, 1))
+            self.canvas.yview_moveto((centro_y * nuevo - alto / 2 - y0) / max(y1 - y0, 1))
+        self.renderizar_vista()
+        
+    def programar_render(self):
+        """Agrupa varios eventos de scroll/resize en un solo redibujado."""
+        if not self.render_pendiente:
+            self.render_pendiente = True
+            self.canvas.after_idle(self.renderizar_vista)
+        
     def setup_info_panel(self, parent):
         """Configura el panel de información."""
         info_frame = ttk.LabelFrame(parent, text="Información", padding="10")
@@ -158,37 +251,77 @@ class AVLVisualizer:
         scrollbar_info = ttk.Scrollbar(info_frame, orient=tk.VERTICAL, command=self.text_info.yview)
         self.text_info.configure(yscrollcommand=scrollbar_info.set)
         
+        self.text_info.tag_configure("enlace", foreground='#1565c0', underline=True)
+        self.text_info.tag_bind("enlace", "<Enter>", lambda e: self.text_info.config(cursor='hand2'))
+        self.text_info.tag_bind("enlace", "<Leave>", lambda e: self.text_info.config(cursor=''))
+        for seccion in ("secuencia", "estructura", "recorrido"):
+            self.text_info.tag_bind(f"mas_{seccion}", "<Button-1>",
+                                    lambda e, s=seccion: self.expandir_seccion(s))
+        
         self.text_info.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar_info.pack(side=tk.RIGHT, fill=tk.Y)
         
     def preparar_historial(self):
-        """Prepara el historial de todos los pasos."""
-        self.historial_arboles = []
-        self.historial_logs = []
+        """Reinicia el historial de pasos.
+
+        No se inserta nada acá: cada paso se calcula recién cuando se pide
+        (obtener_paso), así el tiempo de arranque no depende del largo de la
+        secuencia.
+        """
+        self.checkpoints = {0: None}
+        self.bloque_actual = None
+        self.bloque_pasos = []
         
-        arbol_temp = AVLTree()
+        self.actualizar_display()
         
-        for i, elemento in enumerate(self.secuencia):
+    def obtener_paso(self, paso: int) -> Tuple[Optional[Nodo], List[str]]:
+        """Retorna (raíz del árbol, logs) tras el paso 'paso' (1..len(secuencia)).
+        
+        Los pasos se agrupan en bloques de INTERVALO_CHECKPOINT. Al pedir un paso
+        se reproduce su bloque completo desde el checkpoint que lo precede
+        (un AVLTree persistente, así las raíces de cada paso son versiones
+        independientes) y se deja en caché. Solo se guardan el bloque actual y
+        una raíz por bloque, lo que acota la memoria; ir hacia atrás o saltar a
+        cualquier paso reproduce a lo sumo un bloque (más los bloques
+        intermedios aún no visitados, si se salta hacia adelante).
+        """
+        bloque = (paso - 1) // INTERVALO_CHECKPOINT
+        if bloque != self.bloque_actual:
+            # Avanzar desde el último checkpoint conocido hasta el del bloque pedido
+            ultimo = max(b for b in self.checkpoints if b <= bloque * INTERVALO_CHECKPOINT)
+            for b in range(ultimo // INTERVALO_CHECKPOINT, bloque + 1):
+                self.calcular_bloque(b)
+        return self.bloque_pasos[(paso - 1) % INTERVALO_CHECKPOINT]
+        
+    def calcular_bloque(self, bloque: int):
+        """Reproduce los pasos del bloque desde su checkpoint y guarda el siguiente checkpoint."""
+        inicio = bloque * INTERVALO_CHECKPOINT
+        fin = min(inicio + INTERVALO_CHECKPOINT, len(self.secuencia))
+        
+        arbol_temp = AVLTree(persistente=True)
+        arbol_temp.raiz = self.checkpoints[inicio]
+        
+        self.bloque_pasos = []
+        for elemento in self.secuencia[inicio:fin]:
             arbol_temp.insertar(elemento)
-            logs = arbol_temp.consumir_log()
-            
-            # Crear una copia del árbol actual
-            arbol_copia = self.copiar_arbol(arbol_temp.raiz)
-            self.historial_arboles.append(arbol_copia)
-            self.historial_logs.append(logs.copy())
+            self.bloque_pasos.append((arbol_temp.raiz, arbol_temp.consumir_log()))
         
-        self.actualizar_display()
+        self.bloque_actual = bloque
+        self.checkpoints[fin] = arbol_temp.raiz
         
-    def copiar_arbol(self, nodo: Optional[Nodo]) -> Optional[Nodo]:
-        """Crea una copia profunda del árbol."""
-        if nodo is None:
-            return None
+    def ir_a_paso(self, paso: int):
+        """Salta directamente al paso indicado."""
+        self.paso_actual = max(0, min(paso, len(self.secuencia)))
+        self.actualizar_display()
         
-        nuevo_nodo = Nodo(nodo.clave)
-        nuevo_nodo.altura = nodo.altura
-        nuevo_nodo.izq = self.copiar_arbol(nodo.izq)
-        nuevo_nodo.der = self.copiar_arbol(nodo.der)
-        return nuevo_nodo
+    def ir_a_paso_ingresado(self):
+        """Salta al paso escrito en el campo 'Ir a paso'."""
+        try:
+            paso = int(self.entry_ir_a.get().strip())
+        except ValueError:
+            messagebox.showerror("Error", "Ingresa un número de paso válido.")
+            return
+        self.ir_a_paso(paso)
         
     def paso_anterior(self):
         """Va al paso anterior."""
@@ -223,18 +356,26 @@ class AVLVisualizer:
         """Aplica una secuencia personalizada ingresada por el usuario."""
         texto = self.entry_personalizada.get().strip()
         if not texto or texto == self.placeholder_text:
-            messagebox.showwarning("Advertencia", "Por favor ingresa una secuencia de números.")
+            messagebox.showwarning("Advertencia", "Por favor ingresa una secuencia de números o palabras.")
             return
             
         try:
-            # Parsear la entrada (soporta comas, espacios, o ambos)
-            numeros = []
-            for parte in texto.replace(',', ' ').split():
-                numero = int(parte.strip())
-                if numero < 0:
-                    messagebox.showerror("Error", "Los números deben ser positivos.")
+            # Parsear la entrada (soporta comas, espacios, o ambos). Se aceptan
+            # solo números o solo palabras: mezclados no tienen un orden común.
+            partes = [parte.strip() for parte in texto.replace(',', ' ').split()]
+            if any(not parte.lstrip('-').isdigit() for parte in partes):
+                if any(parte.lstrip('-').isdigit() for parte in partes):
+                    messagebox.showerror("Error", "No se pueden mezclar números y palabras en la misma secuencia.")
                     return
-                numeros.append(numero)
+                numeros = partes
+            else:
+                numeros = []
+                for parte in partes:
+                    numero = int(parte)
+                    if numero < 0:
+                        messagebox.showerror("Error", "Los números deben ser positivos.")
+                        return
+                    numeros.append(numero)
                 
             if len(numeros) == 0:
                 messagebox.showwarning("Advertencia", "No se encontraron números válidos.")
@@ -255,7 +396,7 @@ class AVLVisualizer:
             self.combo_secuencias.set("Personalizada")
             
         except ValueError:
-            messagebox.showerror("Error", "Formato inválido. Usa números separados por comas o espacios.\nEjemplo: 1,2,3,4,5 o 1 2 3 4 5")
+            messagebox.showerror("Error", "Formato inválido. Usa números o palabras separados por comas o espacios.\nEjemplo: 1,2,3,4,5 o pera manzana uva")
             
     def mostrar_ayuda(self):
         """Muestra información sobre las secuencias predefinidas."""
@@ -338,194 +479,376 @@ class AVLVisualizer:
             self.label_elemento.config(text="Árbol vacío")
             
     def dibujar_arbol(self):
-        """Dibuja el árbol en el canvas."""
-        self.canvas.delete("all")
+        """Dibuja el árbol del paso actual en el canvas.
         
+        El layout se calcula una vez por paso; después renderizar_vista dibuja
+        solo lo que cae en la zona visible, de modo que el costo de dibujar no
+        depende del tamaño total del árbol.
+        """
         if self.paso_actual == 0:
-            self.canvas.create_text(300, 250, text="Árbol vacío", 
-                                  font=('Arial', 16), fill='gray')
+            self.limpiar_canvas()
+            self.item_vacio = self.canvas.create_text(300, 250, text="Árbol vacío", 
+                                                    font=('Arial', 16), fill='gray')
             return
             
+        if self.item_vacio is not None:
+            self.canvas.delete(self.item_vacio)
+            self.item_vacio = None
+            
         # Obtener el árbol del paso actual
-        raiz = self.historial_arboles[self.paso_actual - 1]
+        raiz, _ = self.obtener_paso(self.paso_actual)
         
         if raiz is None:
+            self.limpiar_canvas()
             return
             
-        # Calcular posiciones de los nodos
-        posiciones = self.calcular_posiciones(raiz)
-        
+        # Calcular posiciones y extensión de cada subárbol
+        self.raiz_dibujada = raiz
+        self.layout = self.calcular_layout(raiz)
+        
+        # Ajustar scroll y dibujar lo visible
+        self.ajustar_scroll()
+        self.renderizar_vista()
+        
+    def renderizar_vista(self):
+        """Dibuja solo los nodos dentro de la zona visible del canvas.
+        
+        Se recorre el árbol desde la raíz descartando los subárboles cuya
+        extensión horizontal (o cuyo nivel) queda fuera de la vista. Con zoom
+        bajo, los subárboles que en pantalla ocuparían menos de ANCHO_RESUMEN
+        píxeles se dibujan como un único recuadro con su tamaño y altura.
+        """
+        self.render_pendiente = False
+        if self.layout is None:
+            return
+        posiciones, extensiones = self.layout
+        zoom = self.zoom
+        
+        # Zona visible en coordenadas de mundo (con un nodo de margen)
+        vx0 = self.canvas.canvasx(0) / zoom - SEPARACION_NODOS
+        vy0 = self.canvas.canvasy(0) / zoom - ALTO_NIVEL
+        vx1 = vx0 + self.canvas.winfo_width() / zoom + 2 * SEPARACION_NODOS
+        vy1 = vy0 + self.canvas.winfo_height() / zoom + 2 * ALTO_NIVEL
+        
+        visibles = {}      # clave -> (x, y) en el canvas
+        resumenes = {}     # clave -> (x, y, tamaño, altura)
+        conexiones = {}    # (padre, hijo) -> coords de la línea
+        pila = [(self.raiz_dibujada, None)]
+        while pila:
+            nodo, padre = pila.pop()
+            x, y = posiciones[nodo.clave]
+            x_min, x_max, tam = extensiones[nodo.clave]
+            if x_max < vx0 or x_min > vx1 or y > vy1:
+                continue
+            if padre is not None:
+                xp, yp = posiciones[padre.clave]
+                conexiones[(padre.clave, nodo.clave)] = (xp * zoom, yp * zoom + 15 * zoom,
+                                                         x * zoom, y * zoom - 15 * zoom)
+            if zoom < ZOOM_DETALLE and tam > 1 and (x_max - x_min) * zoom < ANCHO_RESUMEN:
+                resumenes[nodo.clave] = (x * zoom, y * zoom, tam, nodo.altura)
+                continue
+            if vx0 <= x <= vx1 and y >= vy0:
+                visibles[nodo.clave] = (x * zoom, y * zoom)
+            for hijo in (nodo.izq, nodo.der):
+                if hijo is not None:
+                    pila.append((hijo, nodo))
+                    
+        # Al cambiar el zoom cambian tamaños y fuentes: los nodos se recrean
+        if zoom != self.zoom_dibujado:
+            for items in self.items_nodos.values():
+                self.canvas.delete(*items)
+            self.items_nodos = {}
+            self.posiciones_dibujadas = {}
+            self.zoom_dibujado = zoom
+            
         # Dibujar conexiones primero (para que queden detrás de los nodos)
-        self.dibujar_conexiones(raiz, posiciones)
+        self.dibujar_conexiones(conexiones)
         
-        # Dibujar nodos
-        self.dibujar_nodos(posiciones)
-        
-        # Ajustar scroll
-        self.ajustar_scroll(posiciones)
+        # Dibujar nodos y resúmenes
+        self.dibujar_nodos(visibles)
+        self.posiciones_dibujadas = visibles
+        self.dibujar_resumenes(resumenes)
         
     def calcular_posiciones(self, raiz: Nodo) -> dict:
-        """Calcula las posiciones de todos los nodos."""
-        posiciones = {}
-        nivel_ancho = {}
-        
-        # Primera pasada: calcular anchos por nivel
-        def calcular_anchos(nodo: Optional[Nodo], nivel: int):
-            if nodo is None:
-                return 0
+        """Calcula las posiciones de todos los nodos (clave -> (x, y))."""
+        return self.calcular_layout(raiz)[0]
+        
+    def calcular_layout(self, raiz: Nodo) -> Tuple[dict, dict]:
+        """Calcula (posiciones, extensiones) de todos los nodos.
+        
+        posiciones: clave -> (x, y). extensiones: clave -> (x mínima, x máxima,
+        cantidad de nodos) del subárbol de esa clave, usadas para descartar
+        subárboles fuera de la vista.
+        
+        Layout "tidy" al estilo Reingold–Tilford, en O(n) para árboles AVL:
+        cada subárbol se arma por separado y se guarda su contorno (x mínima y
+        máxima por nivel, relativas a su raíz); los dos hijos se separan lo
+        justo para que sus contornos no se superpongan, y el padre queda
+        centrado entre ellos. Así no hay superposiciones para ningún tamaño y
+        el ancho crece con el árbol (el scroll lo sigue en ajustar_scroll).
+        Las claves son únicas dentro de un árbol, por lo que sirven de id.
+        """
+        desplazamientos = {}  # clave -> x relativa al padre
+        relativas = {}        # clave -> (x mínima, x máxima, tamaño) del subárbol, relativas al nodo
+        
+        def armar(nodo: Nodo) -> Tuple[List[int], List[int]]:
+            """Retorna los contornos (izquierdo, derecho) del subárbol, relativos a 'nodo'."""
+            contorno_izq, contorno_der, tam = armar_contornos(nodo)
+            relativas[nodo.clave] = (min(contorno_izq), max(contorno_der), tam)
+            return contorno_izq, contorno_der
+            
+        def armar_contornos(nodo: Nodo) -> Tuple[List[int], List[int], int]:
+            if nodo.izq is None and nodo.der is None:
+                return [0], [0], 1
+            if nodo.izq is None or nodo.der is None:
+                # Un solo hijo: se corre medio paso hacia su lado
+                hijo = nodo.izq if nodo.izq is not None else nodo.der
+                delta = -SEPARACION_NODOS // 2 if hijo is nodo.izq else SEPARACION_NODOS // 2
+                izq, der = armar(hijo)
+                desplazamientos[hijo.clave] = delta
+                return ([0] + [x + delta for x in izq], [0] + [x + delta for x in der],
+                        1 + relativas[hijo.clave][2])
                 
-            ancho_izq = calcular_anchos(nodo.izq, nivel + 1)
-            ancho_der = calcular_anchos(nodo.der, nivel + 1)
-            ancho_total = ancho_izq + ancho_der + 1
+            izq_izq, izq_der = armar(nodo.izq)
+            der_izq, der_der = armar(nodo.der)
             
-            if nivel not in nivel_ancho:
-                nivel_ancho[nivel] = 0
-            nivel_ancho[nivel] = max(nivel_ancho[nivel], ancho_total)
+            # Separación mínima entre las raíces de ambos hijos (solo en niveles comunes)
+            sep = SEPARACION_NODOS
+            for a, b in zip(izq_der, der_izq):
+                if a - b + SEPARACION_NODOS > sep:
+                    sep = a - b + SEPARACION_NODOS
+            sep += sep % 2
+            mitad = sep // 2
+            desplazamientos[nodo.izq.clave] = -mitad
+            desplazamientos[nodo.der.clave] = mitad
             
-            return ancho_total
+            # Contornos del padre: en cada nivel manda el subárbol que llega a ese nivel
+            # (el izquierdo para el borde izquierdo, si llega; el derecho para el derecho).
+            contorno_izq = [0] + [x - mitad for x in izq_izq]
+            if len(der_izq) > len(izq_izq):
+                contorno_izq.extend(x + mitad for x in der_izq[len(izq_izq):])
+            contorno_der = [0] + [x + mitad for x in der_der]
+            if len(izq_der) > len(der_der):
+                contorno_der.extend(x - mitad for x in izq_der[len(der_der):])
+            return contorno_izq, contorno_der, 1 + relativas[nodo.izq.clave][2] + relativas[nodo.der.clave][2]
             
-        calcular_anchos(raiz, 0)
+        contorno_izq, _ = armar(raiz)
         
-        # Segunda pasada: asignar posiciones
-        def asignar_posiciones(nodo: Optional[Nodo], nivel: int, x_inicio: int, x_fin: int):
-            if nodo is None:
-                return
+        # Segunda pasada: coordenadas absolutas, corridas para que el mínimo quede en MARGEN
+        posiciones = {}
+        extensiones = {}
+        pila = [(raiz, MARGEN - min(contorno_izq), 0)]
+        while pila:
+            nodo, x, nivel = pila.pop()
+            posiciones[nodo.clave] = (x, MARGEN + nivel * ALTO_NIVEL)
+            x_min, x_max, tam = relativas[nodo.clave]
+            extensiones[nodo.clave] = (x + x_min, x + x_max, tam)
+            for hijo in (nodo.izq, nodo.der):
+                if hijo is not None:
+                    pila.append((hijo, x + desplazamientos[hijo.clave], nivel + 1))
+        return posiciones, extensiones
+        
+    def limpiar_canvas(self):
+        """Borra todos los ítems del canvas y olvida los ids guardados."""
+        self.canvas.delete("all")
+        self.items_nodos = {}
+        self.items_conexiones = {}
+        self.posiciones_dibujadas = {}
+        self.item_vacio = None
+        self.items_resumenes = {}
+        self.raiz_dibujada = None
+        self.layout = None
+        
+    def dibujar_conexiones(self, conexiones: dict):
+        """Dibuja las líneas que conectan los nodos (solo crea/mueve/borra las que cambiaron).
+        
+        conexiones: (clave padre, clave hijo) -> coordenadas de la línea.
+        """
+        nuevas = False
+        for par in list(self.items_conexiones):
+            if par not in conexiones:
+                self.canvas.delete(self.items_conexiones.pop(par)[0])
                 
-            x_centro = (x_inicio + x_fin) // 2
-            y = 50 + nivel * 80
-            
-            posiciones[nodo.clave] = (x_centro, y)
-            
-            # Calcular posiciones de hijos
-            if nodo.izq or nodo.der:
-                ancho_total = x_fin - x_inicio
-                if nodo.izq and nodo.der:
-                    # Ambos hijos
-                    mitad = ancho_total // 2
-                    asignar_posiciones(nodo.izq, nivel + 1, x_inicio, x_inicio + mitad)
-                    asignar_posiciones(nodo.der, nivel + 1, x_inicio + mitad, x_fin)
-                elif nodo.izq:
-                    # Solo hijo izquierdo
-                    asignar_posiciones(nodo.izq, nivel + 1, x_inicio, x_centro)
-                else:
-                    # Solo hijo derecho
-                    asignar_posiciones(nodo.der, nivel + 1, x_centro, x_fin)
-                    
-        asignar_posiciones(raiz, 0, 50, 550)
-        return posiciones
-        
-    def dibujar_conexiones(self, nodo: Optional[Nodo], posiciones: dict):
-        """Dibuja las líneas que conectan los nodos."""
-        if nodo is None:
-            return
-            
-        x_nodo, y_nodo = posiciones[nodo.clave]
-        
-        # Conectar con hijo izquierdo
-        if nodo.izq:
-            x_izq, y_izq = posiciones[nodo.izq.clave]
-            self.canvas.create_line(x_nodo, y_nodo + 15, x_izq, y_izq - 15, 
-                                  fill='#666', width=2)
-            self.dibujar_conexiones(nodo.izq, posiciones)
-            
-        # Conectar con hijo derecho
-        if nodo.der:
-            x_der, y_der = posiciones[nodo.der.clave]
-            self.canvas.create_line(x_nodo, y_nodo + 15, x_der, y_der - 15, 
-                                  fill='#666', width=2)
-            self.dibujar_conexiones(nodo.der, posiciones)
+        for par, coords in conexiones.items():
+            item = self.items_conexiones.get(par)
+            if item is None:
+                self.items_conexiones[par] = (self.canvas.create_line(
+                    *coords, fill='#666', width=2, tags="conexion"), coords)
+                nuevas = True
+            elif item[1] != coords:
+                self.canvas.coords(item[0], *coords)
+                self.items_conexiones[par] = (item[0], coords)
+                
+        # Las líneas quedan detrás de los nodos
+        if nuevas:
+            self.canvas.tag_lower("conexion")
             
     def dibujar_nodos(self, posiciones: dict):
-        """Dibuja los nodos del árbol."""
+        """Dibuja los nodos del árbol (solo crea/mueve/borra los que cambiaron)."""
+        previas = self.posiciones_dibujadas
+        rx, ry = 20 * self.zoom, 15 * self.zoom
+        con_texto = self.zoom >= ZOOM_DETALLE
+        for clave in list(self.items_nodos):
+            if clave not in posiciones:
+                self.canvas.delete(*self.items_nodos.pop(clave))
+                
         for clave, (x, y) in posiciones.items():
-            # Círculo del nodo
-            self.canvas.create_oval(x-20, y-15, x+20, y+15, 
-                                  fill='#4CAF50', outline='#2E7D32', width=2)
-            
-            # Texto del nodo
-            self.canvas.create_text(x, y, text=str(clave), 
-                                  font=('Arial', 12, 'bold'), fill='white')
+            items = self.items_nodos.get(clave)
+            if items is None:
+                # Círculo del nodo
+                ovalo = self.canvas.create_oval(x-rx, y-ry, x+rx, y+ry, 
+                                              fill='#4CAF50', outline='#2E7D32', width=2)
+                
+                # Texto del nodo (se omite si el zoom es tan bajo que no se leería)
+                if con_texto:
+                    texto = self.canvas.create_text(x, y, text=str(clave), 
+                                                  font=('Arial', max(1, round(12 * self.zoom)), 'bold'),
+                                                  fill='white')
+                    self.items_nodos[clave] = (ovalo, texto)
+                else:
+                    self.items_nodos[clave] = (ovalo,)
+            elif previas.get(clave) != (x, y):
+                self.canvas.coords(items[0], x-rx, y-ry, x+rx, y+ry)
+                if len(items) > 1:
+                    self.canvas.coords(items[1], x, y)
                                   
-    def ajustar_scroll(self, posiciones: dict):
-        """Ajusta el área de scroll del canvas."""
-        if not posiciones:
-            return
+    def dibujar_resumenes(self, resumenes: dict):
+        """Dibuja los subárboles resumidos (recuadro con cantidad de nodos y altura)."""
+        for clave in list(self.items_resumenes):
+            if clave not in resumenes:
+                self.canvas.delete(*self.items_resumenes.pop(clave)[:2])
+                
+        for clave, (x, y, tam, altura) in resumenes.items():
+            items = self.items_resumenes.get(clave)
+            if items is not None and items[2] == (x, y, tam, altura):
+                continue
+            if items is not None:
+                self.canvas.delete(*items[:2])
+            rect = self.canvas.create_rectangle(x - 28, y - 14, x + 28, y + 14,
+                                                fill='#C8E6C9', outline='#2E7D32')
+            texto = self.canvas.create_text(x, y, text=f"{tam} nodos\nh={altura}",
+                                            font=('Arial', 7), fill='#1B5E20')
+            self.items_resumenes[clave] = (rect, texto, (x, y, tam, altura))
             
-        # Calcular bounding box
-        x_coords = [pos[0] for pos in posiciones.values()]
-        y_coords = [pos[1] for pos in posiciones.values()]
+    def ajustar_scroll(self) -> Tuple[float, float, float, float]:
+        """Ajusta el área de scroll del canvas a la extensión del árbol (con el zoom actual)."""
+        _, extensiones = self.layout
+        x_min, x_max, _ = extensiones[self.raiz_dibujada.clave]
+        y_max = MARGEN + (self.raiz_dibujada.altura - 1) * ALTO_NIVEL
         
-        min_x, max_x = min(x_coords) - 50, max(x_coords) + 50
-        min_y, max_y = min(y_coords) - 50, max(y_coords) + 50
-        
-        self.canvas.configure(scrollregion=(min_x, min_y, max_x, max_y))
+        region = ((x_min - 50) * self.zoom, (MARGEN - 50) * self.zoom,
+                  (x_max + 50) * self.zoom, (y_max + 50) * self.zoom)
+        self.canvas.configure(scrollregion=region)
+        return region
         
     def actualizar_informacion(self):
-        """Actualiza el panel de información."""
-        self.text_info.delete(1.0, tk.END)
+        """Actualiza el panel de información.
+        
+        Todo el texto se arma en un solo buffer y se inserta con una única
+        llamada a Tk. Las secciones largas (secuencia, estructura, recorrido)
+        muestran solo las primeras LINEAS_INFO líneas o claves; el enlace
+        "Mostrar más" de cada sección amplía su límite y vuelve a armar el panel.
+        """
+        if self.paso_info != self.paso_actual:
+            self.paso_info = self.paso_actual
+            self.limites_info = {}
+        partes = []  # pares (texto, tags) para Text.insert
         
         if self.paso_actual == 0:
-            self.text_info.insert(tk.END, "=== Árbol AVL Vacío ===\n\n")
-            self.text_info.insert(tk.END, "Presiona 'Siguiente' para comenzar la inserción.\n\n")
-            self.text_info.insert(tk.END, f"Secuencia a insertar ({len(self.secuencia)} elementos):\n")
+            partes.append(("=== Árbol AVL Vacío ===\n\n", ()))
+            partes.append(("Presiona 'Siguiente' para comenzar la inserción.\n\n", ()))
+            partes.append((f"Secuencia a insertar ({len(self.secuencia)} elementos):\n", ()))
             
             # Mostrar la secuencia en columnas si es muy larga
+            limite = self.limite_info("secuencia")
             if len(self.secuencia) <= 10:
-                for i, elem in enumerate(self.secuencia, 1):
-                    self.text_info.insert(tk.END, f"{i}. {elem}\n")
+                lineas = [f"{i}. {elem}" for i, elem in enumerate(self.secuencia[:limite], 1)]
             else:
-                # Mostrar en columnas
-                for i in range(0, len(self.secuencia), 5):
-                    linea = ""
-                    for j in range(5):
-                        if i + j < len(self.secuencia):
-                            elem = self.secuencia[i + j]
-                            linea += f"{i+j+1:2d}. {elem:3d}  "
-                    self.text_info.insert(tk.END, linea + "\n")
+                visibles = self.secuencia[:limite * 5]
+                lineas = ["".join(f"{i+j+1:2d}. {elem!s:>3}  " for j, elem in enumerate(visibles[i:i + 5]))
+                          for i in range(0, len(visibles), 5)]
+                limite *= 5
+            partes.append(("\n".join(lineas) + "\n", ()))
+            self.agregar_mostrar_mas(partes, "secuencia", len(self.secuencia) - limite)
+            self.escribir_informacion(partes)
             return
             
         # Información del paso actual
         elemento = self.secuencia[self.paso_actual - 1]
-        self.text_info.insert(tk.END, f"=== Paso {self.paso_actual}: Insertar {elemento} ===\n\n")
+        partes.append((f"=== Paso {self.paso_actual}: Insertar {elemento} ===\n\n", ()))
         
         # Mostrar logs de rotaciones
-        logs = self.historial_logs[self.paso_actual - 1]
+        raiz, logs = self.obtener_paso(self.paso_actual)
         if logs:
-            self.text_info.insert(tk.END, "Operaciones realizadas:\n")
-            for log in logs:
-                self.text_info.insert(tk.END, f"• {log}\n")
-            self.text_info.insert(tk.END, "\n")
+            partes.append(("Operaciones realizadas:\n" + "".join(f"• {log}\n" for log in logs) + "\n", ()))
         else:
-            self.text_info.insert(tk.END, "Inserción simple (sin rotaciones)\n\n")
+            partes.append(("Inserción simple (sin rotaciones)\n\n", ()))
             
-        # Mostrar árbol en ASCII
         arbol_temp = AVLTree()
-        arbol_temp.raiz = self.historial_arboles[self.paso_actual - 1]
-        self.text_info.insert(tk.END, "Estructura del árbol:\n")
-        self.text_info.insert(tk.END, arbol_temp.ascii_simple())
-        self.text_info.insert(tk.END, "\n\n")
-        
-        # Mostrar recorrido en orden
-        recorrido = arbol_temp.recorrido_inorden()
-        self.text_info.insert(tk.END, f"Recorrido en-orden: {recorrido}\n")
-        
-        # Mostrar información de balance
-        self.text_info.insert(tk.END, "\nInformación de balance:\n")
-        self.mostrar_info_balance(arbol_temp.raiz, 0)
-        
-    def mostrar_info_balance(self, nodo: Optional[Nodo], nivel: int):
-        """Muestra información de balance de cada nodo."""
-        if nodo is None:
+        arbol_temp.raiz = raiz
+        
+        # Mostrar árbol en ASCII: se cuenta hasta limite+1 nodos para no recorrer
+        # árboles grandes que de todos modos no se van a mostrar enteros
+        limite = self.limite_info("estructura")
+        partes.append(("Estructura del árbol:\n", ()))
+        if sum(1 for _ in islice(arbol_temp.iter_inorden(), limite + 1)) <= limite:
+            partes.append((arbol_temp.ascii_simple() + "\n", ()))
+        else:
+            partes.append((f"(más de {limite} nodos, estructura omitida)\n", ()))
+            self.agregar_mostrar_mas(partes, "estructura", None)
+        partes.append(("\n", ()))
+        
+        # Mostrar recorrido en orden (solo las primeras 'limite' claves)
+        limite = self.limite_info("recorrido")
+        recorrido = list(islice(arbol_temp.iter_inorden(), limite + 1))
+        if len(recorrido) > limite:
+            partes.append((f"Recorrido en-orden: {recorrido[:limite]} …\n", ()))
+            self.agregar_mostrar_mas(partes, "recorrido", None)
+        else:
+            partes.append((f"Recorrido en-orden: {recorrido}\n", ()))
+        
+        # Mostrar información de balance del camino de inserción
+        partes.append((f"\nInformación de balance (camino hasta {elemento}):\n", ()))
+        partes.append((self.info_balance_camino(raiz, elemento), ()))
+        self.escribir_informacion(partes)
+        
+    def limite_info(self, seccion: str) -> int:
+        """Cantidad de líneas (o claves) a mostrar de 'seccion' en el paso actual."""
+        return self.limites_info.get(seccion, LINEAS_INFO)
+        
+    def agregar_mostrar_mas(self, partes, seccion: str, restantes: Optional[int]):
+        """Agrega a 'partes' el enlace que amplía el límite de 'seccion' (si quedan elementos)."""
+        if restantes is not None and restantes <= 0:
             return
-            
-        indent = "  " * nivel
-        fb = AVLTree.fb_estatico(nodo)
-        estado = "✓ Balanceado" if abs(fb) <= 1 else "⚠ Desbalanceado"
+        texto = "▼ Mostrar más" + (f" (quedan {restantes})" if restantes is not None else "")
+        partes.append((texto + "\n", ("enlace", f"mas_{seccion}")))
         
-        self.text_info.insert(tk.END, f"{indent}Nodo {nodo.clave}: altura={nodo.altura}, FB={fb} {estado}\n")
+    def expandir_seccion(self, seccion: str):
+        """Amplía el límite de una sección del panel y lo vuelve a armar."""
+        self.limites_info[seccion] = self.limite_info(seccion) * 4
+        self.actualizar_informacion()
         
-        self.mostrar_info_balance(nodo.izq, nivel + 1)
-        self.mostrar_info_balance(nodo.der, nivel + 1)
+    def escribir_informacion(self, partes):
+        """Reemplaza el contenido del panel con 'partes' en una única llamada a Tk."""
+        self.text_info.delete(1.0, tk.END)
+        args = []
+        for texto, tags in partes:
+            args.extend((texto, tags))
+        self.text_info.insert(tk.END, *args)
+        
+    def info_balance_camino(self, raiz: Optional[Nodo], clave: int) -> str:
+        """Texto con altura y FB de los nodos desde la raíz hasta 'clave' (O(altura))."""
+        lineas = []
+        nodo, nivel = raiz, 0
+        while nodo is not None:
+            fb = AVLTree.fb_estatico(nodo)
+            estado = "✓ Balanceado" if abs(fb) <= 1 else "⚠ Desbalanceado"
+            lineas.append(f"{'  ' * nivel}Nodo {nodo.clave}: altura={nodo.altura}, FB={fb} {estado}\n")
+            if clave == nodo.clave:
+                break
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
+            nivel += 1
+        return "".join(lineas)
 
 
 def main():
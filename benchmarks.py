@@ -0,0 +1,543 @@
+"""Benchmarks de rendimiento para AVLTree.
+
+Uso:
+    python3 benchmarks.py                          # todos los escenarios, tamaño por defecto
+    python3 benchmarks.py -n 200000                # otro tamaño
+    python3 benchmarks.py -n 1e3,1e4,1e5,1e6 formas ascii
+    python3 benchmarks.py --json actual.json       # guardar resultados
+    python3 benchmarks.py --comparar base.json     # comparar contra una corrida anterior
+
+Las claves salen de generadores con semilla fija, así que dos corridas con los
+mismos argumentos miden exactamente las mismas operaciones.
+"""
+from __future__ import annotations
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+from avl_arreglo import AVLTreeArreglo
+from avl_congelado import AVLCongelado, congelar
+from main import AVLTree, Evento, Nodo, formatear_evento
+
+
+@dataclass
+class NodoDataclass:
+    """Nodo original (dataclass con __dict__ por instancia), como referencia de memoria."""
+    clave: int
+    izq: Optional["NodoDataclass"] = None
+    der: Optional["NodoDataclass"] = None
+    altura: int = 1
+
+
+class AVLTreeRecursivo(AVLTree):
+    """Inserción recursiva original (una llamada por nivel), como referencia de 'antes'."""
+
+    def insertar(self, clave: int) -> None:
+        if self._log is not None:
+            self._log.clear()
+        self.raiz = self._insertar(self.raiz, clave)
+
+    def _insertar(self, n: Optional[Nodo], clave: int) -> Nodo:
+        if n is None:
+            return Nodo(clave)
+        if clave < n.clave:
+            n.izq = self._insertar(n.izq, clave)
+        elif clave > n.clave:
+            n.der = self._insertar(n.der, clave)
+        else:
+            if self._log is not None:
+                self._log.append((Evento.DUPLICADA, clave, 0, None))
+            return n
+        self._actualizar_altura(n)
+        fb = self.fb_estatico(n)
+        if fb < -1 or fb > 1:
+            return self._reequilibrar(n, fb)
+        return n
+
+
+class AVLTreeLogInmediato(AVLTree):
+    """Formatea cada mensaje al momento de insertar, como hacía el log original."""
+
+    def insertar(self, clave: int) -> None:
+        super().insertar(clave)
+        self.mensajes = [formatear_evento(e) for e in self._log]
+
+
+def _claves(n: int, semilla: int = 12345) -> List[int]:
+    rnd = random.Random(semilla)
+    return [rnd.randrange(n * 10) for _ in range(n)]
+
+
+def _medir(fn: Callable[[], object]) -> float:
+    inicio = time.perf_counter()
+    fn()
+    return time.perf_counter() - inicio
+
+
+def bench_insercion(n: int) -> Dict[str, float]:
+    """Claves/segundo insertando n claves aleatorias: recursivo vs iterativo."""
+    claves = _claves(n)
+    resultados: Dict[str, float] = {}
+    for nombre, cls in (("recursivo", AVLTreeRecursivo), ("iterativo", AVLTree),
+                        ("arreglo", AVLTreeArreglo)):
+        arbol = cls()
+        insertar = arbol.insertar
+        t = _medir(lambda: [insertar(c) for c in claves])
+        resultados[nombre] = n / t
+    return resultados
+
+
+def bench_carga_masiva(n: int) -> Dict[str, float]:
+    """Claves/segundo armando un árbol de n claves: insertar una a una vs from_iterable."""
+    claves = _claves(n)
+    resultados: Dict[str, float] = {}
+
+    def una_a_una() -> None:
+        arbol = AVLTree()
+        for c in claves:
+            arbol.insertar(c)
+
+    resultados["insertar"] = n / _medir(una_a_una)
+    resultados["from_iterable"] = n / _medir(lambda: AVLTree.from_iterable(claves))
+    ordenadas = sorted(claves)
+    resultados["from_sorted"] = n / _medir(lambda: AVLTree.from_sorted(ordenadas))
+    return resultados
+
+
+def bench_insercion_lotes(n: int) -> Dict[str, float]:
+    """Claves/segundo agregando lotes a un árbol de n claves: insertar una a una vs insertar_muchos.
+
+    Los dos lotes grandes quedan a ambos lados del corte de insertar_muchos (0.6 n).
+    """
+    base = _claves(n)
+    resultados: Dict[str, float] = {}
+    for tam_lote in (n // 1000 or 1, n // 10, n // 2, n * 7 // 10):
+        lote = _claves(tam_lote, semilla=tam_lote)
+        arbol = AVLTree.from_iterable(base)
+        resultados[f"insertar (lote {tam_lote})"] = tam_lote / _medir(lambda: [arbol.insertar(c) for c in lote])
+        arbol = AVLTree.from_iterable(base)
+        resultados[f"insertar_muchos (lote {tam_lote})"] = tam_lote / _medir(lambda: arbol.insertar_muchos(lote))
+    return resultados
+
+
+def bench_conjuntos(n: int) -> Dict[str, float]:
+    """Operaciones/segundo entre un árbol de n claves y otro de n/100: volcar y reinsertar vs join/split."""
+    grande = _claves(n)
+    chico = _claves(max(1, n // 100), semilla=3)
+    resultados: Dict[str, float] = {}
+
+    a, b = AVLTree.from_iterable(grande), AVLTree.from_iterable(chico)
+    resultados["reinsertar"] = 1 / _medir(lambda: [a.insertar(c) for c in b.recorrido_inorden()])
+    a, b = AVLTree.from_iterable(grande), AVLTree.from_iterable(chico)
+    resultados["union"] = 1 / _medir(lambda: a.union(b))
+
+    arbol = AVLTree.from_iterable(grande)
+    pivotes = _claves(1000, semilla=5)
+
+    def dividir_y_unir() -> None:
+        nonlocal arbol
+        for p in pivotes:
+            menores, mayores = arbol.dividir(p)
+            arbol = AVLTree.unir(menores, p, mayores)
+
+    resultados["dividir + unir"] = len(pivotes) / _medir(dividir_y_unir)
+    return resultados
+
+
+def bench_eliminacion(n: int) -> Dict[str, float]:
+    """Claves/segundo eliminando de n claves: reconstruir desde la lista vs eliminar vs eliminar_muchos.
+
+    eliminar_muchos se mide con lotes alrededor de su corte (la mitad del árbol).
+    """
+    claves = sorted(set(_claves(n)))
+    resultados: Dict[str, float] = {}
+
+    arbol = AVLTree.from_sorted(claves)
+    lote = claves[::2][:20]
+
+    def reconstruyendo() -> None:
+        # Lo que había que hacer antes: filtrar recorrido_inorden() y reinsertar, por cada clave.
+        nonlocal arbol
+        for v in lote:
+            restantes = [c for c in arbol.recorrido_inorden() if c != v]
+            arbol = AVLTree.from_sorted(restantes)
+
+    resultados["reconstruir"] = len(lote) / _medir(reconstruyendo)
+
+    for tam_lote in (len(claves) // 20, len(claves) * 2 // 5, len(claves) * 3 // 5):
+        victimas = random.Random(tam_lote).sample(claves, tam_lote)
+        arbol = AVLTree.from_sorted(claves)
+        resultados[f"eliminar (lote {tam_lote})"] = tam_lote / _medir(lambda: [arbol.eliminar(v) for v in victimas])
+        arbol = AVLTree.from_sorted(claves)
+        resultados[f"eliminar_muchos (lote {tam_lote})"] = tam_lote / _medir(lambda: arbol.eliminar_muchos(victimas))
+    return resultados
+
+
+def bench_consultas(n: int) -> Dict[str, float]:
+    """Consultas/segundo sobre un árbol de n claves: 'in' sobre recorrido_inorden() vs contiene/piso/techo."""
+    claves = _claves(n)
+    arbol = AVLTree.from_iterable(claves)
+    consultas = _claves(n, semilla=999)
+    resultados: Dict[str, float] = {}
+    pocas = consultas[:20]
+    resultados["in recorrido_inorden"] = len(pocas) / _medir(lambda: [c in arbol.recorrido_inorden() for c in pocas])
+    resultados["contiene"] = n / _medir(lambda: [arbol.contiene(c) for c in consultas])
+    resultados["piso"] = n / _medir(lambda: [arbol.piso(c) for c in consultas])
+    resultados["techo"] = n / _medir(lambda: [arbol.techo(c) for c in consultas])
+    return resultados
+
+
+def bench_recorridos(n: int) -> Dict[str, float]:
+    """Claves/segundo recorriendo un árbol de n claves, y rangos chicos (~100 claves) por segundo."""
+    claves = _claves(n)
+    arbol = AVLTree.from_iterable(claves)
+    tam = len(arbol.recorrido_inorden())
+    resultados: Dict[str, float] = {}
+    resultados["recorrido_inorden"] = tam / _medir(arbol.recorrido_inorden)
+    resultados["iter_inorden"] = tam / _medir(lambda: sum(1 for _ in arbol.iter_inorden()))
+    ordenadas = sorted(set(claves))
+    inicios = [ordenadas[i] for i in range(0, len(ordenadas) - 100, max(1, len(ordenadas) // 1000))]
+    resultados["rango (~100 claves)"] = len(inicios) / _medir(
+        lambda: [sum(1 for _ in arbol.rango(lo, lo + 1000)) for lo in inicios])
+    return resultados
+
+
+def bench_estadisticos_orden(n: int) -> Dict[str, float]:
+    """Consultas/segundo de k-ésimo, rango y conteo: vía recorrido_inorden() vs con_tamanos=True."""
+    claves = _claves(n)
+    arbol = AVLTree.from_iterable(claves, con_tamanos=True)
+    total = arbol.tam(arbol.raiz)
+    rnd = random.Random(7)
+    ks = [rnd.randrange(total) for _ in range(1000)]
+    consultas = [rnd.randrange(n * 10) for _ in range(1000)]
+    resultados: Dict[str, float] = {}
+    pocas = ks[:5]
+    resultados["lista k_esimo"] = len(pocas) / _medir(lambda: [arbol.recorrido_inorden()[k] for k in pocas])
+    resultados["k_esimo"] = len(ks) / _medir(lambda: [arbol.k_esimo(k) for k in ks])
+    resultados["rango_de"] = len(consultas) / _medir(lambda: [arbol.rango_de(c) for c in consultas])
+    resultados["contar_entre"] = len(consultas) / _medir(
+        lambda: [arbol.contar_entre(c, c + n) for c in consultas])
+    return resultados
+
+
+def bench_log(n: int) -> Dict[str, float]:
+    """Claves/segundo insertando n claves ascendentes (una rotación cada ~2 claves) según el modo de log."""
+    claves = list(range(n))
+    resultados: Dict[str, float] = {}
+    for nombre, crear in (("texto inmediato", AVLTreeLogInmediato),
+                          ("eventos (por defecto)", AVLTree),
+                          ("log apagado", lambda: AVLTree(registrar_log=False))):
+        arbol = crear()
+        insertar = arbol.insertar
+        resultados[nombre] = n / _medir(lambda: [insertar(c) for c in claves])
+    return resultados
+
+
+def bench_metricas(n: int) -> Dict[str, float]:
+    """Claves/segundo insertando n claves aleatorias con las métricas apagadas vs encendidas."""
+    claves = _claves(n)
+    resultados: Dict[str, float] = {}
+    for nombre, metricas in (("metricas apagadas", False), ("metricas encendidas", True)):
+        arbol = AVLTree(registrar_log=False, metricas=metricas)
+        insertar = arbol.insertar
+        resultados[nombre] = n / _medir(lambda: [insertar(c) for c in claves])
+    return resultados
+
+
+def bench_disco(n: int) -> Dict[str, float]:
+    """Claves/segundo restaurando un árbol de n claves: reinsertar todo vs guardar/cargar."""
+    claves = _claves(n)
+    arbol = AVLTree.from_iterable(claves, registrar_log=False)
+    orden = arbol.recorrido_inorden()
+    resultados: Dict[str, float] = {}
+
+    def reinsertar() -> None:
+        nuevo = AVLTree(registrar_log=False)
+        for c in claves:
+            nuevo.insertar(c)
+
+    resultados["reinsertar"] = n / _medir(reinsertar)
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "arbol.avl")
+        resultados["guardar"] = len(orden) / _medir(lambda: arbol.guardar(ruta))
+        resultados["cargar"] = len(orden) / _medir(lambda: AVLTree.cargar(ruta, registrar_log=False))
+    return resultados
+
+
+def bench_congelado(n: int) -> Dict[str, float]:
+    """Consultas/segundo sobre n claves: AVLTree en memoria vs AVLCongelado (mmap); y aperturas/segundo."""
+    arbol = AVLTree.from_iterable(_claves(n), registrar_log=False)
+    consultas = _claves(n, semilla=999)
+    resultados: Dict[str, float] = {}
+    resultados["AVLTree.contiene"] = n / _medir(lambda: [arbol.contiene(c) for c in consultas])
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "arbol.avlc")
+        congelar(arbol, ruta)
+        with AVLCongelado(ruta) as congelado:
+            resultados["AVLCongelado.contiene"] = n / _medir(lambda: [congelado.contiene(c) for c in consultas])
+            resultados["AVLCongelado.piso"] = n / _medir(lambda: [congelado.piso(c) for c in consultas])
+        resultados["abrir AVLCongelado"] = 1 / _medir(lambda: AVLCongelado(ruta).cerrar())
+    return resultados
+
+
+def bench_formas(n: int) -> Dict[str, float]:
+    """Claves/segundo insertando n claves con las formas de secuencias_predefinidas, y con muchos duplicados."""
+    formas = {
+        "aleatoria": _claves(n),
+        "creciente": list(range(1, n + 1)),
+        "decreciente": list(range(n, 0, -1)),
+        "duplicados (n/10 distintas)": [c % max(1, n // 10) for c in _claves(n)],
+    }
+    resultados: Dict[str, float] = {}
+    for nombre, claves in formas.items():
+        arbol = AVLTree()
+        insertar = arbol.insertar
+        resultados[nombre] = n / _medir(lambda: [insertar(c) for c in claves])
+    return resultados
+
+
+def bench_multiconjunto(n: int) -> Dict[str, float]:
+    """Claves/segundo contando n claves con muchos duplicados: AVLTree + dict de cuentas vs multiconjunto=True."""
+    claves = [c % max(1, n // 10) for c in _claves(n)]
+    resultados: Dict[str, float] = {}
+
+    def con_dict() -> None:
+        arbol, cuentas = AVLTree(), {}
+        for c in claves:
+            arbol.insertar(c)
+            cuentas[c] = cuentas.get(c, 0) + 1
+
+    def multiconjunto() -> None:
+        arbol = AVLTree(multiconjunto=True)
+        for c in claves:
+            arbol.insertar(c)
+
+    resultados["AVLTree + dict"] = n / _medir(con_dict)
+    resultados["multiconjunto"] = n / _medir(multiconjunto)
+    return resultados
+
+
+class _SalidaNula(io.TextIOBase):
+    """Descarta lo escrito: mide el costo de generar el texto, no el de guardarlo."""
+
+    def write(self, texto: str) -> int:
+        return len(texto)
+
+
+def bench_ascii(n: int) -> Dict[str, float]:
+    """Claves/segundo renderizando un árbol de n claves en ASCII, como string y escribiendo a un stream."""
+    arbol = AVLTree.from_iterable(_claves(n))
+    tam = len(arbol.recorrido_inorden())
+    salida = _SalidaNula()
+    resultados: Dict[str, float] = {}
+    resultados["ascii"] = tam / _medir(arbol.ascii)
+    resultados["ascii (stream)"] = tam / _medir(lambda: arbol.ascii(salida=salida))
+    resultados["ascii_simple"] = tam / _medir(arbol.ascii_simple)
+    resultados["arbol_tradicional (stream)"] = tam / _medir(lambda: arbol.arbol_tradicional(salida))
+    return resultados
+
+
+def bench_visualizador(n: int) -> Dict[str, float]:
+    """Pasos/segundo del historial del visualizador y claves/segundo de su layout, sin abrir ventanas.
+
+    Requiere Tkinter instalado (solo para importar el módulo).
+    """
+    from avl_visualizer import AVLVisualizer
+
+    def visualizador() -> AVLVisualizer:
+        vis = AVLVisualizer.__new__(AVLVisualizer)
+        vis.secuencia = _claves(n)
+        vis.checkpoints = {0: None}
+        vis.bloque_actual = None
+        vis.bloque_pasos = []
+        return vis
+
+    resultados: Dict[str, float] = {}
+    vis = visualizador()
+    resultados["historial: avanzar paso a paso"] = n / _medir(
+        lambda: [vis.obtener_paso(p) for p in range(1, n + 1)])
+    vis = visualizador()
+    resultados["historial: saltar al último paso"] = 1 / _medir(lambda: vis.obtener_paso(n))
+    raiz = vis.obtener_paso(n)[0]
+    tam = len(vis.calcular_layout(raiz)[0])
+    resultados["calcular_layout"] = tam / _medir(lambda: vis.calcular_layout(raiz))
+    return resultados
+
+
+def _copiar_arbol(n: Optional[Nodo]) -> Optional[Nodo]:
+    """Copia profunda recursiva, como hacía el visualizador en cada paso."""
+    if n is None:
+        return None
+    return Nodo(n.clave, _copiar_arbol(n.izq), _copiar_arbol(n.der), n.altura)
+
+
+def bench_historial(n: int) -> Dict[str, float]:
+    """Pasos/segundo y bytes por paso guardando el árbol de cada paso: copia profunda vs modo persistente.
+
+    La copia profunda es O(n^2): se mide con a lo sumo 3000 pasos.
+    """
+    resultados: Dict[str, float] = {}
+    for nombre, pasos, persistente in (("copia profunda", min(n, 3000), False),
+                                       ("persistente", n, True)):
+        claves = _claves(pasos)
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        arbol = AVLTree(persistente=persistente)
+        historial = []
+        for c in claves:
+            arbol.insertar(c)
+            historial.append(arbol.raiz if persistente else _copiar_arbol(arbol.raiz))
+        resultados[f"{nombre} pasos/s"] = pasos / (time.perf_counter() - inicio)
+        resultados[f"{nombre} bytes/paso"] = tracemalloc.get_traced_memory()[0] / pasos
+        tracemalloc.stop()
+        del historial
+    return resultados
+
+
+def _bytes_por_clave(cls: type, n: int) -> float:
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    nodos = [cls(0) for _ in range(n)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Se descuenta la lista que los contiene (8 bytes por puntero).
+    return (despues - antes) / len(nodos) - 8
+
+
+def bench_memoria_nodo(n: int) -> Dict[str, float]:
+    """Bytes por clave (sin contar el int) del nodo dataclass original vs Nodo con __slots__."""
+    return {
+        "NodoDataclass": _bytes_por_clave(NodoDataclass, n),
+        "Nodo (__slots__)": _bytes_por_clave(Nodo, n),
+    }
+
+
+def bench_memoria_arbol(n: int) -> Dict[str, float]:
+    """Bytes por clave de un árbol completo de n claves (incluye los int): AVLTree vs AVLTreeArreglo."""
+    resultados: Dict[str, float] = {}
+    for nombre, cls in (("AVLTree", AVLTree), ("AVLTreeArreglo", AVLTreeArreglo)):
+        tracemalloc.start()
+        arbol = cls()
+        for c in range(n):
+            arbol.insertar(c)
+        resultados[nombre] = tracemalloc.get_traced_memory()[0] / n
+        tracemalloc.stop()
+        del arbol
+    return resultados
+
+
+# nombre -> (función, unidad del resultado)
+ESCENARIOS: Dict[str, Tuple[Callable[[int], Dict[str, float]], str]] = {
+    "insercion": (bench_insercion, "ops/s"),
+    "carga_masiva": (bench_carga_masiva, "ops/s"),
+    "insercion_lotes": (bench_insercion_lotes, "ops/s"),
+    "conjuntos": (bench_conjuntos, "ops/s"),
+    "eliminacion": (bench_eliminacion, "ops/s"),
+    "consultas": (bench_consultas, "ops/s"),
+    "recorridos": (bench_recorridos, "ops/s"),
+    "estadisticos_orden": (bench_estadisticos_orden, "ops/s"),
+    "log": (bench_log, "ops/s"),
+    "metricas": (bench_metricas, "ops/s"),
+    "disco": (bench_disco, "ops/s"),
+    "congelado": (bench_congelado, "ops/s"),
+    "formas": (bench_formas, "ops/s"),
+    "multiconjunto": (bench_multiconjunto, "ops/s"),
+    "ascii": (bench_ascii, "ops/s"),
+    "visualizador": (bench_visualizador, "ops/s"),
+    "historial": (bench_historial, ""),
+    "memoria_nodo": (bench_memoria_nodo, "bytes/clave"),
+    "memoria_arbol": (bench_memoria_arbol, "bytes/clave"),
+}
+
+
+def _tamanos(texto: str) -> List[int]:
+    """Convierte "1e3,1e4" en [1000, 10000]."""
+    return [int(float(t)) for t in texto.split(",")]
+
+
+def _pico_memoria(fn: Callable[[int], Dict[str, float]], n: int) -> Optional[int]:
+    """Pico de memoria (bytes, según tracemalloc) de una corrida aparte del escenario.
+
+    Es None para los escenarios que usan tracemalloc por su cuenta (lo detienen al terminar).
+    """
+    tracemalloc.start()
+    try:
+        fn(n)
+        if not tracemalloc.is_tracing():
+            return None
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _comparar(base: Dict[str, Any], actual: Dict[str, Any], consola: TextIO) -> None:
+    """Imprime la variación de cada métrica de 'actual' respecto de 'base' (mismo escenario y n)."""
+    previos = {(r["escenario"], r["n"]): r for r in base["resultados"]}
+    print(f"== comparación contra {base['meta'].get('fecha', '?')} ==", file=consola)
+    for r in actual["resultados"]:
+        previo = previos.get((r["escenario"], r["n"]))
+        if previo is None:
+            continue
+        print(f"-- {r['escenario']} (n={r['n']}) --", file=consola)
+        for clave, valor in r["resultados"].items():
+            antes = previo["resultados"].get(clave)
+            if antes:
+                print(f"  {clave:<32} {antes:>14,.0f} -> {valor:>14,.0f}  {(valor / antes - 1) * 100:+7.1f}%",
+                      file=consola)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks de AVLTree")
+    parser.add_argument("-n", type=_tamanos, default=[100_000],
+                        help="cantidad(es) de claves separadas por coma, p. ej. -n 1e3,1e4,1e5,1e6")
+    parser.add_argument("escenarios", nargs="*", default=list(ESCENARIOS), help="escenarios a correr")
+    parser.add_argument("--json", metavar="ARCHIVO", help="guardar los resultados en JSON ('-' para stdout)")
+    parser.add_argument("--comparar", metavar="ARCHIVO", help="JSON de una corrida anterior contra el cual comparar")
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="no medir el pico de memoria (evita correr cada escenario dos veces)")
+    args = parser.parse_args()
+
+    informe: Dict[str, Any] = {
+        "meta": {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+        },
+        "resultados": [],
+    }
+    consola = sys.stderr if args.json == "-" else sys.stdout
+    for n in args.n:
+        for nombre in args.escenarios:
+            fn, unidad = ESCENARIOS[nombre]
+            resultados = fn(n)
+            pico = None if args.sin_memoria else _pico_memoria(fn, n)
+            print(f"== {nombre} (n={n}) ==", file=consola)
+            for clave, valor in resultados.items():
+                print(f"  {clave:<32} {valor:>14,.0f} {unidad}", file=consola)
+            if pico is not None:
+                print(f"  {'pico de memoria':<32} {pico / 2**20:>14,.1f} MiB", file=consola)
+            informe["resultados"].append({"escenario": nombre, "n": n, "unidad": unidad,
+                                          "resultados": resultados, "pico_memoria_bytes": pico})
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            _comparar(json.load(f), informe, consola)
+    if args.json == "-":
+        json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
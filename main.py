@@ -1,6 +1,12 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from array import array
+from enum import Enum
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, List, Sequence, TextIO, Tuple
+import json
+import math
+import struct
 import time
 import sys
 
@@ -8,22 +14,467 @@ import sys
 # - Altura(árbol vacío) = 0; Altura(hoja) = 1.
 # - FB(n) = altura(der) - altura(izq).
 # - Se imprimen alturas y FB en el ASCII-art.
+# - Las claves pueden ser de cualquier tipo con orden total (int, str, tuplas...).
+
+Clave = Any
+
+
+class Evento(Enum):
+    """Tipos de evento que registra el log de operaciones."""
+    DUPLICADA = "duplicada"
+    NO_ENCONTRADA = "no_encontrada"
+    LL = "LL"
+    LR = "LR"
+    RR = "RR"
+    RL = "RL"
+
+
+# Un evento del log: (tipo, clave, FB, clave del hijo rotado primero en LR/RL).
+# Se guardan tuplas y el texto se arma recién en consumir_log().
+RegistroEvento = Tuple[Evento, Clave, int, Optional[Clave]]
+
+# Fracción del árbol a partir de la cual eliminar_muchos filtra y reconstruye
+# en lugar de eliminar clave por clave (cruce medido con benchmarks.py eliminacion).
+_PROPORCION_RECONSTRUIR_ELIMINAR = 0.5
+# Lo mismo para insertar_muchos (mezclar con el recorrido en-orden y reconstruir).
+_PROPORCION_RECONSTRUIR_INSERTAR = 0.6
+
+# Archivo de AVLTree.guardar(): firma, versión, tipo de array de las alturas, cantidad de nodos.
+_CABECERA_ARCHIVO = struct.Struct("<4sBcQ")
+_FIRMA_ARCHIVO = b"AVL\x00"
+_VERSION_ARCHIVO = 1
+
+
+def formatear_evento(evento: RegistroEvento) -> str:
+    """Convierte un evento del log en el mensaje legible."""
+    tipo, clave, fb, hijo = evento
+    if tipo is Evento.DUPLICADA:
+        return f"Clave {clave} duplicada: se ignora."
+    if tipo is Evento.NO_ENCONTRADA:
+        return f"Clave {clave} no encontrada: no se elimina."
+    if tipo is Evento.LL:
+        return f"Desbalance en {clave} (FB={fb}). Patrón LL → Rotación simple a la derecha en {clave}."
+    if tipo is Evento.RR:
+        return f"Desbalance en {clave} (FB={fb}). Patrón RR → Rotación simple a la izquierda en {clave}."
+    if tipo is Evento.LR:
+        return (f"Desbalance en {clave} (FB={fb}). Patrón LR → "
+                f"Rotación simple a la izquierda en {hijo} y luego a la derecha en {clave}.")
+    return (f"Desbalance en {clave} (FB={fb}). Patrón RL → "
+            f"Rotación simple a la derecha en {hijo} y luego a la izquierda en {clave}.")
+
 
-@dataclass
 class Nodo:
-    clave: int
-    izq: Optional["Nodo"] = None
-    der: Optional["Nodo"] = None
-    altura: int = 1  # hoja = 1
+    """Nodo del árbol. Usa __slots__ (sin __dict__ por instancia) para reducir la memoria por clave."""
+
+    __slots__ = ("clave", "izq", "der", "altura")
+
+    # Ocurrencias de la clave. Fuera del modo multiconjunto es siempre 1 y no
+    # ocupa memoria por nodo (atributo de clase); NodoMulti lo vuelve un slot.
+    cuenta = 1
+    # Valor asociado (uso como diccionario) o elemento original (con key=).
+    # Igual que 'cuenta': solo NodoValor/NodoTamValor lo guardan por nodo.
+    valor = None
+
+    def __init__(self, clave: Clave, izq: Optional["Nodo"] = None,
+                 der: Optional["Nodo"] = None, altura: int = 1) -> None:
+        self.clave = clave
+        self.izq = izq
+        self.der = der
+        self.altura = altura  # hoja = 1
+
+    def __repr__(self) -> str:
+        return f"Nodo(clave={self.clave!r}, izq={self.izq!r}, der={self.der!r}, altura={self.altura!r})"
 
     def __str__(self) -> str:
-        return f"{self.clave}[h={self.altura},FB={AVLTree.fb_estatico(self)}]"
+        veces = f"×{self.cuenta}" if self.cuenta != 1 else ""
+        return f"{self.clave}{veces}[h={self.altura},FB={AVLTree.fb_estatico(self)}]"
 
 
-class AVLTree:
+class NodoTam(Nodo):
+    """Nodo aumentado con el tamaño de su subárbol (para estadísticos de orden)."""
+
+    __slots__ = ("tam",)
+
+    def __init__(self, clave: Clave, izq: Optional["Nodo"] = None,
+                 der: Optional["Nodo"] = None, altura: int = 1, tam: int = 1) -> None:
+        super().__init__(clave, izq, der, altura)
+        self.tam = tam  # hoja = 1 (en multiconjunto, suma de las cuentas del subárbol)
+
+
+class NodoValor(Nodo):
+    """Nodo con valor asociado (AVLTree(con_valores=True) o key=)."""
+
+    __slots__ = ("valor",)
+
+    def __init__(self, clave: Clave, izq: Optional["Nodo"] = None,
+                 der: Optional["Nodo"] = None, altura: int = 1, valor: Any = None) -> None:
+        super().__init__(clave, izq, der, altura)
+        self.valor = valor
+
+
+class NodoTamValor(NodoTam):
+    """NodoTam con valor asociado."""
+
+    __slots__ = ("valor",)
+
+    def __init__(self, clave: Clave, izq: Optional["Nodo"] = None, der: Optional["Nodo"] = None,
+                 altura: int = 1, tam: int = 1, valor: Any = None) -> None:
+        super().__init__(clave, izq, der, altura, tam)
+        self.valor = valor
+
+
+class NodoMulti(Nodo):
+    """Nodo de multiconjunto: guarda cuántas veces se insertó su clave."""
+
+    __slots__ = ("cuenta",)
+
+    def __init__(self, clave: Clave, izq: Optional["Nodo"] = None,
+                 der: Optional["Nodo"] = None, altura: int = 1, cuenta: int = 1) -> None:
+        super().__init__(clave, izq, der, altura)
+        self.cuenta = cuenta
+
+
+class NodoTamMulti(NodoTam):
+    """NodoTam de multiconjunto (tam cuenta ocurrencias, no claves distintas)."""
+
+    __slots__ = ("cuenta",)
+
+    def __init__(self, clave: Clave, izq: Optional["Nodo"] = None, der: Optional["Nodo"] = None,
+                 altura: int = 1, tam: int = 1, cuenta: int = 1) -> None:
+        super().__init__(clave, izq, der, altura, tam)
+        self.cuenta = cuenta
+
+
+class MetricasAVL:
+    """Contadores y tiempos de un AVLTree creado con metricas=True.
+
+    - rotaciones: cantidad de reequilibrados por caso (LL, LR, RR, RL).
+    - duplicadas: inserciones ignoradas por clave repetida (en modo
+      multiconjunto, las que solo sumaron una ocurrencia), incluidas las de
+      insertar_muchos: repetidas dentro del lote o ya presentes en el árbol.
+    - profundidades: histograma profundidad -> cantidad de inserciones, donde la
+      profundidad es la cantidad de nodos recorridos al descender. Solo cuenta
+      inserciones clave por clave: la reconstrucción de insertar_muchos no desciende.
+    - tiempos: histograma por operación de duraciones en cubetas logarítmicas
+      (CUBETAS_POR_OCTAVA por cada potencia de 2 de nanosegundos), más la suma
+      y el máximo; ocupa lo mismo sin importar cuántas operaciones se midan.
+      insertar/eliminar miden cada clave (también las que los lotes procesan
+      de a una); insertar_muchos/eliminar_muchos miden cada llamada completa.
+    """
+
+    OPERACIONES = ("insertar", "eliminar", "insertar_muchos", "eliminar_muchos")
+    PERCENTILES = (50, 90, 99)
+    CUBETAS_POR_OCTAVA = 4  # cubetas de ~19% de ancho: los percentiles son aproximados
+
     def __init__(self) -> None:
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        self.rotaciones: Dict[str, int] = {e.value: 0 for e in (Evento.LL, Evento.LR, Evento.RR, Evento.RL)}
+        self.duplicadas = 0
+        self.profundidades: Dict[int, int] = {}
+        self.tiempos: Dict[str, Dict[int, int]] = {op: {} for op in self.OPERACIONES}
+        self.tiempo_total: Dict[str, float] = {op: 0.0 for op in self.OPERACIONES}
+        self.tiempo_max: Dict[str, float] = {op: 0.0 for op in self.OPERACIONES}
+
+    def registrar_profundidad(self, profundidad: int) -> None:
+        self.profundidades[profundidad] = self.profundidades.get(profundidad, 0) + 1
+
+    def registrar_tiempo(self, operacion: str, segundos: float) -> None:
+        ns = segundos * 1e9
+        cubeta = int(math.log2(ns) * self.CUBETAS_POR_OCTAVA) if ns > 1 else 0
+        histograma = self.tiempos[operacion]
+        histograma[cubeta] = histograma.get(cubeta, 0) + 1
+        self.tiempo_total[operacion] += segundos
+        if segundos > self.tiempo_max[operacion]:
+            self.tiempo_max[operacion] = segundos
+
+    def _resumen_tiempos(self, operacion: str) -> Dict[str, float]:
+        """Cantidad, promedio, percentiles y máximo, en microsegundos.
+
+        Cada percentil es el límite superior de la cubeta donde cae (rango más
+        cercano), acotado por el máximo observado.
+        """
+        histograma = self.tiempos[operacion]
+        total = sum(histograma.values())
+        if not total:
+            return {"cantidad": 0}
+        maximo_us = self.tiempo_max[operacion] * 1e6
+        resumen = {"cantidad": total, "promedio_us": self.tiempo_total[operacion] / total * 1e6}
+        cubetas = sorted(histograma.items())
+        for p in self.PERCENTILES:
+            rango = max(1, -(-p * total // 100))
+            acumulado = 0
+            for cubeta, cantidad in cubetas:
+                acumulado += cantidad
+                if acumulado >= rango:
+                    break
+            limite_us = 2 ** ((cubeta + 1) / self.CUBETAS_POR_OCTAVA) / 1e3
+            resumen[f"p{p}_us"] = min(limite_us, maximo_us)
+        resumen["max_us"] = maximo_us
+        return resumen
+
+    def instantanea(self) -> Dict[str, object]:
+        """Copia de las métricas actuales como dict de tipos básicos (serializable a JSON)."""
+        return {
+            "rotaciones": dict(self.rotaciones),
+            "duplicadas": self.duplicadas,
+            "profundidades": {str(p): c for p, c in sorted(self.profundidades.items())},
+            "tiempos": {op: self._resumen_tiempos(op) for op in self.tiempos},
+        }
+
+
+class AVLTree:
+    def __init__(self, con_tamanos: bool = False, registrar_log: bool = True,
+                 persistente: bool = False, metricas: bool = False,
+                 key: Optional[Callable[[Any], Clave]] = None, multiconjunto: bool = False,
+                 con_valores: bool = False) -> None:
+        """
+        Args:
+            con_tamanos: Si True, cada nodo guarda el tamaño de su subárbol
+                (NodoTam), habilitando rango_de/k_esimo/contar_entre en O(log n).
+            registrar_log: Si False, no se registra ningún evento (consumir_log
+                siempre retorna []); útil para cargas masivas.
+            persistente: Si True, insertar/eliminar nunca modifican nodos
+                existentes: copian solo el camino afectado (O(log n) nodos) y
+                dejan una nueva 'raiz'. Cada raíz anterior sigue siendo una
+                versión válida e inmutable del árbol, que comparte con las
+                demás todos los nodos no tocados.
+            metricas: Si True, se cuentan rotaciones por caso, duplicadas y
+                profundidad de cada inserción, y se mide la duración de cada
+                insertar/eliminar y de cada lote (ver MetricasAVL). Apagado
+                solo agrega unos chequeos 'is None' por operación (tres en
+                _insertar) y una llamada intermedia en insertar/eliminar.
+            key: Función que deriva la clave de orden de cada elemento (como
+                en sorted). Se aplica una sola vez por elemento y la clave
+                derivada queda guardada en el nodo ('clave'), así el descenso
+                compara claves ya calculadas; el elemento original queda en
+                'valor'. Todo método que recibe claves (insertar, eliminar,
+                contiene, obtener, piso, techo, rango, rango_de, contar_entre,
+                dividir, unir, ...) recibe elementos y les aplica key; lo que
+                se retorna o genera como clave (piso, techo, minimo, rango,
+                k_esimo, la iteración) son claves derivadas, y obtener/items
+                dan los elementos. Como 'valor' ya guarda el elemento,
+                asignar y t[...] = v no están disponibles.
+            multiconjunto: Si True, insertar una clave repetida suma 1 a la
+                cuenta de su nodo (sin reestructurar ni registrar eventos) y
+                eliminar la resta; el nodo se quita recién al llegar a 0. Ver
+                contar(), total() y conteos(). Con con_tamanos=True los
+                estadísticos de orden cuentan ocurrencias. No admite key= ni
+                con_valores.
+            con_valores: Si True, cada nodo guarda un valor asociado (NodoValor)
+                y el árbol sirve de diccionario ordenado: asignar, obtener,
+                t[clave], items(), valores(). Sin esta opción (ni key=) los
+                nodos no reservan lugar para el valor.
+        """
         self.raiz: Optional[Nodo] = None
-        self._log: List[str] = []  # guarda mensajes de rotaciones/apuntes por inserción
+        # Eventos (rotaciones/apuntes) de la última operación; None si el log está apagado.
+        self._log: Optional[List[RegistroEvento]] = [] if registrar_log else None
+        self._con_tamanos = con_tamanos
+        self._con_valores = con_valores or key is not None
+        if multiconjunto and self._con_valores:
+            raise ValueError("multiconjunto no admite key= ni con_valores=True.")
+        if multiconjunto:
+            self._nodo = NodoTamMulti if con_tamanos else NodoMulti
+        elif self._con_valores:
+            self._nodo = NodoTamValor if con_tamanos else NodoValor
+        else:
+            self._nodo = NodoTam if con_tamanos else Nodo
+        self._multiconjunto = multiconjunto
+        self._total = 0  # ocurrencias en el árbol (solo se mantiene en modo multiconjunto)
+        self._persistente = persistente
+        self._metricas: Optional[MetricasAVL] = MetricasAVL() if metricas else None
+        self._key = key
+
+    # -------- Carga masiva --------
+    @classmethod
+    def from_iterable(cls, claves: Iterable[Clave], **opciones) -> "AVLTree":
+        """Construye un árbol balanceado a partir de claves en cualquier orden.
+
+        Ordena una vez (O(n log n)), descarta duplicados y arma el árbol
+        directamente, sin rotaciones ni mensajes de log. Las 'opciones' se
+        pasan al constructor (ej.: con_tamanos=True).
+        """
+        arbol = cls(**opciones)
+        arbol._cargar_lote(*arbol._lote_ordenado(claves, ordenar=True))
+        return arbol
+
+    @classmethod
+    def from_sorted(cls, claves: Iterable[Clave], **opciones) -> "AVLTree":
+        """Construye un árbol balanceado en O(n) a partir de claves ya ordenadas.
+
+        No se verifica el orden: se confía en la entrada. Los duplicados
+        consecutivos se descartan (con key=, los de igual clave derivada:
+        queda el primero), o se cuentan en modo multiconjunto.
+        """
+        arbol = cls(**opciones)
+        arbol._cargar_lote(*arbol._lote_ordenado(claves))
+        return arbol
+
+    def _cargar_lote(self, claves: List[Clave], valores: Optional[List[Any]], cuentas: Optional[List[int]]) -> None:
+        """Reemplaza el contenido por el árbol balanceado de un lote de _lote_ordenado."""
+        self.raiz = self._construir_balanceado(claves, 0, len(claves), valores, cuentas)
+        if self._multiconjunto:
+            self._total = sum(cuentas)
+
+    @staticmethod
+    def _sin_duplicados_consecutivos(claves: Iterable[Clave]) -> List[Clave]:
+        unicas: List[Clave] = []
+        for clave in claves:
+            if not unicas or clave != unicas[-1]:
+                unicas.append(clave)
+        return unicas
+
+    def _lote_ordenado(self, elementos: Iterable[Any], ordenar: bool = False
+                       ) -> Tuple[List[Clave], Optional[List[Any]], Optional[List[int]]]:
+        """(claves, valores, cuentas) de los elementos en orden, agrupando los consecutivos iguales.
+
+        Sin key= los valores son None; con key= las claves son las derivadas
+        (calculadas una vez por elemento) y los valores, los elementos. Las
+        cuentas (ocurrencias de cada clave) son None fuera del modo multiconjunto.
+        """
+        if self._key is None and not self._multiconjunto:
+            return self._sin_duplicados_consecutivos(sorted(elementos) if ordenar else elementos), None, None
+        if self._key is None:
+            pares: Iterable[Tuple[Clave, Any]] = ((e, None) for e in (sorted(elementos) if ordenar else elementos))
+        else:
+            pares = ((self._key(e), e) for e in elementos)
+            if ordenar:
+                pares = sorted(pares, key=itemgetter(0))
+        claves: List[Clave] = []
+        valores: List[Any] = []
+        cuentas: List[int] = []
+        for clave, elemento in pares:
+            if claves and clave == claves[-1]:
+                cuentas[-1] += 1
+            else:
+                claves.append(clave)
+                valores.append(elemento)
+                cuentas.append(1)
+        return (claves, valores if self._key is not None else None,
+                cuentas if self._multiconjunto else None)
+
+    def _construir_balanceado(self, claves: Sequence[Clave], inicio: int, fin: int,
+                              valores: Optional[Sequence[Any]] = None,
+                              cuentas: Optional[Sequence[int]] = None) -> Optional[Nodo]:
+        """Arma el subárbol de claves[inicio:fin] tomando el medio como raíz."""
+        if inicio >= fin:
+            return None
+        medio = (inicio + fin) // 2
+        n = self._nodo(claves[medio])
+        if valores is not None:
+            n.valor = valores[medio]
+        if cuentas is not None:
+            n.cuenta = cuentas[medio]
+        n.izq = self._construir_balanceado(claves, inicio, medio, valores, cuentas)
+        n.der = self._construir_balanceado(claves, medio + 1, fin, valores, cuentas)
+        h_izq = n.izq.altura if n.izq is not None else 0
+        h_der = n.der.altura if n.der is not None else 0
+        n.altura = 1 + (h_izq if h_izq > h_der else h_der)
+        if self._con_tamanos:
+            if cuentas is None:
+                n.tam = fin - inicio
+            else:
+                self._actualizar_tam(n)
+        return n
+
+    # -------- Guardar / cargar en disco --------
+    def guardar(self, ruta: str) -> None:
+        """Guarda el árbol en 'ruta' en formato binario compacto.
+
+        Formato (little-endian): cabecera _CABECERA_ARCHIVO (firma, versión,
+        tipo de las alturas, cantidad de nodos), luego las claves en preorden
+        como int64 y las alturas en el mismo orden (int8, o int32 si algún
+        nodo supera altura 127, posible con insertar_sin_balancear). El
+        preorden alcanza para reconstruir exactamente la misma forma.
+        """
+        claves = array("q")
+        alturas: List[int] = []
+        pila: List[Nodo] = [self.raiz] if self.raiz is not None else []
+        try:
+            while pila:
+                n = pila.pop()
+                if n.valor is not None or n.cuenta != 1:
+                    raise ValueError("guardar() no guarda valores asociados, elementos de key= ni cuentas.")
+                claves.append(n.clave)
+                alturas.append(n.altura)
+                if n.der is not None:
+                    pila.append(n.der)
+                if n.izq is not None:
+                    pila.append(n.izq)
+        except (OverflowError, TypeError) as e:
+            raise ValueError("guardar() solo admite claves enteras de 64 bits.") from e
+        tipo_alturas = "b" if not alturas or max(alturas) <= 127 else "i"
+        alturas_arr = array(tipo_alturas, alturas)
+        if sys.byteorder == "big":
+            claves.byteswap()
+            alturas_arr.byteswap()
+        with open(ruta, "wb") as f:
+            f.write(_CABECERA_ARCHIVO.pack(_FIRMA_ARCHIVO, _VERSION_ARCHIVO,
+                                           tipo_alturas.encode("ascii"), len(claves)))
+            claves.tofile(f)
+            alturas_arr.tofile(f)
+
+    @classmethod
+    def cargar(cls, ruta: str, **opciones) -> "AVLTree":
+        """Reconstruye un árbol guardado con guardar(), en O(n) y sin rotaciones.
+
+        Los enlaces salen del preorden con una pila: cada clave es hija
+        izquierda del tope si es menor, o hija derecha del último nodo
+        desapilado mientras el tope sea menor. Las alturas se leen del
+        archivo. Las 'opciones' se pasan al constructor (ej.: con_tamanos=True).
+        """
+        with open(ruta, "rb") as f:
+            cabecera = f.read(_CABECERA_ARCHIVO.size)
+            if len(cabecera) != _CABECERA_ARCHIVO.size:
+                raise ValueError(f"{ruta}: archivo demasiado corto.")
+            firma, version, tipo_alturas, cantidad = _CABECERA_ARCHIVO.unpack(cabecera)
+            if firma != _FIRMA_ARCHIVO or version != _VERSION_ARCHIVO:
+                raise ValueError(f"{ruta}: no es un árbol guardado con guardar().")
+            claves, alturas = array("q"), array(tipo_alturas.decode("ascii"))
+            try:
+                claves.fromfile(f, cantidad)
+                alturas.fromfile(f, cantidad)
+            except (EOFError, ValueError) as e:
+                raise ValueError(f"{ruta}: archivo truncado.") from e
+        if sys.byteorder == "big":
+            claves.byteswap()
+            alturas.byteswap()
+
+        arbol = cls(**opciones)
+        nodo = arbol._nodo
+        pila: List[Nodo] = []
+        for clave, altura in zip(claves.tolist(), alturas.tolist()):
+            n = nodo(clave, None, None, altura)
+            if not pila:
+                arbol.raiz = n
+            elif clave < pila[-1].clave:
+                pila[-1].izq = n
+            else:
+                padre = pila.pop()
+                while pila and pila[-1].clave < clave:
+                    padre = pila.pop()
+                padre.der = n
+            pila.append(n)
+        if arbol._con_tamanos:
+            arbol._recalcular_tamanos()
+        if arbol._multiconjunto:
+            arbol._total = cantidad
+        return arbol
+
+    def _recalcular_tamanos(self) -> None:
+        """Recalcula 'tam' de todos los nodos en postorden (iterativo)."""
+        pila: List[Tuple[NodoTam, bool]] = [(self.raiz, False)] if self.raiz is not None else []
+        while pila:
+            n, hijos_listos = pila.pop()
+            if hijos_listos:
+                self._actualizar_tam(n)
+                continue
+            pila.append((n, True))
+            if n.der is not None:
+                pila.append((n.der, False))
+            if n.izq is not None:
+                pila.append((n.izq, False))
 
     # -------- Utilitarios de altura / FB --------
     @staticmethod
@@ -39,6 +490,51 @@ class AVLTree:
     def _actualizar_altura(self, n: Nodo) -> None:
         n.altura = 1 + max(self.altura(n.izq), self.altura(n.der))
 
+    @staticmethod
+    def tam(n: Optional[Nodo]) -> int:
+        """Tamaño del subárbol (solo para árboles con con_tamanos=True)."""
+        return n.tam if n else 0
+
+    def _actualizar_tam(self, n: NodoTam) -> None:
+        n.tam = n.cuenta + self.tam(n.izq) + self.tam(n.der)
+
+    # -------- Copia de caminos (modo persistente) --------
+    def _nodo_nuevo(self, clave: Clave, valor: Any = None) -> Nodo:
+        """Hoja para 'clave'; 'valor' solo se pasa a las variantes que lo guardan."""
+        return self._nodo(clave, valor=valor) if self._con_valores else self._nodo(clave)
+
+    def _copiar_nodo(self, n: Nodo) -> Nodo:
+        copia = self._nodo(n.clave, n.izq, n.der, n.altura)
+        if self._con_valores:
+            copia.valor = n.valor
+        if self._con_tamanos:
+            copia.tam = n.tam
+        if self._multiconjunto:
+            copia.cuenta = n.cuenta
+        return copia
+
+    def _copiar_camino(self, camino: List[Nodo]) -> List[Nodo]:
+        """Copia los nodos de un camino raíz→abajo, los re-enlaza entre sí y cuelga la copia como nueva raíz."""
+        copias = [self._copiar_nodo(n) for n in camino]
+        for i in range(1, len(copias)):
+            if copias[i - 1].izq is camino[i]:
+                copias[i - 1].izq = copias[i]
+            else:
+                copias[i - 1].der = copias[i]
+        self.raiz = copias[0]
+        return copias
+
+    def _copiar_para_rotar(self, n: Nodo, fb: int) -> None:
+        """Copia los hijos de 'n' que tocará _reequilibrar y que no están en el camino copiado."""
+        if fb < -1:
+            hijo = n.izq = self._copiar_nodo(n.izq)
+            if self.fb_estatico(hijo) > 0:
+                hijo.der = self._copiar_nodo(hijo.der)
+        else:
+            hijo = n.der = self._copiar_nodo(n.der)
+            if self.fb_estatico(hijo) < 0:
+                hijo.izq = self._copiar_nodo(hijo.izq)
+
     # -------- Rotaciones --------
     def _rotacion_der(self, a: Nodo) -> Nodo:
         """Rotación simple a la derecha (caso LL)."""
@@ -48,6 +544,9 @@ class AVLTree:
         b.der = a
         self._actualizar_altura(a)
         self._actualizar_altura(b)
+        if self._con_tamanos:
+            self._actualizar_tam(a)
+            self._actualizar_tam(b)
         return b
 
     def _rotacion_izq(self, a: Nodo) -> Nodo:
@@ -58,215 +557,1047 @@ class AVLTree:
         c.izq = a
         self._actualizar_altura(a)
         self._actualizar_altura(c)
+        if self._con_tamanos:
+            self._actualizar_tam(a)
+            self._actualizar_tam(c)
         return c
 
     # -------- Inserción con reequilibrado --------
-    def insertar(self, clave: int) -> None:
-        """Inserta 'clave' y reequilibra si es necesario."""
-        self._log.clear()
-        self.raiz = self._insertar(self.raiz, clave)
-    
-    def insertar_sin_balancear(self, clave: int) -> None:
-        """Inserta 'clave' sin reequilibrar (para mostrar estados intermedios)."""
-        self._log.clear()
-        self.raiz = self._insertar_sin_balancear(self.raiz, clave)
+    def insertar(self, clave: Clave) -> bool:
+        """Inserta 'clave' y reequilibra si es necesario. Retorna False si ya estaba."""
+        valor = None
+        if self._key is not None:
+            clave, valor = self._key(clave), clave
+        if self._log is not None:
+            self._log.clear()
+        return self._insertar_medido(clave, valor)
+
+    def _insertar_medido(self, clave: Clave, valor: Any = None) -> bool:
+        """_insertar, registrando su duración si hay métricas."""
+        if self._metricas is None:
+            return self._insertar(clave, valor)
+        inicio = time.perf_counter()
+        insertada = self._insertar(clave, valor)
+        self._metricas.registrar_tiempo("insertar", time.perf_counter() - inicio)
+        return insertada
 
-    def _insertar(self, n: Optional[Nodo], clave: int) -> Nodo:
+    def _insertar(self, clave: Clave, valor: Any = None) -> bool:
+        """Versión iterativa: desciende guardando el camino en una pila explícita
+        y luego retrocede actualizando alturas. El retroceso se corta en cuanto
+        la altura de un subárbol no cambia (los ancestros no pueden
+        desbalancearse) o tras la primera rotación (que restaura la altura
+        previa del subárbol).
+        """
+        n = self.raiz
         if n is None:
-            return Nodo(clave)
+            self.raiz = self._nodo_nuevo(clave, valor)
+            if self._multiconjunto:
+                self._total += 1
+            if self._metricas is not None:
+                self._metricas.registrar_profundidad(0)
+            return True
 
-        if clave < n.clave:
-            n.izq = self._insertar(n.izq, clave)
-        elif clave > n.clave:
-            n.der = self._insertar(n.der, clave)
+        camino: List[Nodo] = []
+        while n is not None:
+            camino.append(n)
+            if clave < n.clave:
+                n = n.izq
+            elif clave > n.clave:
+                n = n.der
+            else:
+                if self._metricas is not None:
+                    self._metricas.duplicadas += 1
+                    self._metricas.registrar_profundidad(len(camino))
+                if self._multiconjunto:
+                    # Se cuenta la ocurrencia en el nodo: la forma del árbol no cambia.
+                    self._sumar_ocurrencia(camino, 1)
+                    return False
+                # Claves duplicadas: no insertamos
+                if self._log is not None:
+                    self._log.append((Evento.DUPLICADA, clave, 0, None))
+                return False
+
+        if self._metricas is not None:
+            self._metricas.registrar_profundidad(len(camino))
+
+        if self._persistente:
+            camino = self._copiar_camino(camino)
+        padre = camino[-1]
+        if clave < padre.clave:
+            padre.izq = self._nodo_nuevo(clave, valor)
         else:
-            # Claves duplicadas: no insertamos (o podríamos contar frecuencia)
-            self._log.append(f"Clave {clave} duplicada: se ignora.")
-            return n
+            padre.der = self._nodo_nuevo(clave, valor)
+        if self._multiconjunto:
+            self._total += 1
+        if self._con_tamanos:
+            for n in camino:
+                n.tam += 1
 
-        # Actualizar altura y chequear balance
-        self._actualizar_altura(n)
-        fb = self.fb_estatico(n)
+        for i in range(len(camino) - 1, -1, -1):
+            n = camino[i]
+            izq, der = n.izq, n.der
+            h_izq = izq.altura if izq is not None else 0
+            h_der = der.altura if der is not None else 0
+            nueva_altura = 1 + (h_izq if h_izq > h_der else h_der)
+            if nueva_altura == n.altura:
+                return True  # la altura no cambió: nada más arriba puede desbalancearse
+            n.altura = nueva_altura
 
+            fb = h_der - h_izq
+            if -1 <= fb <= 1:
+                continue
+
+            nueva_raiz = self._reequilibrar(n, fb)
+            if i == 0:
+                self.raiz = nueva_raiz
+            elif camino[i - 1].izq is n:
+                camino[i - 1].izq = nueva_raiz
+            else:
+                camino[i - 1].der = nueva_raiz
+            return True  # tras rotar, el subárbol recupera su altura previa
+        return True
+
+    def _sumar_ocurrencia(self, camino: List[Nodo], delta: int) -> None:
+        """Suma 'delta' a la cuenta del último nodo de 'camino' (raíz→nodo), sin reestructurar."""
+        if self._persistente:
+            camino = self._copiar_camino(camino)
+        camino[-1].cuenta += delta
+        if self._con_tamanos:
+            for n in camino:
+                n.tam += delta
+        self._total += delta
+
+    def _reequilibrar(self, n: Nodo, fb: int) -> Nodo:
+        """Aplica la rotación que corresponda a 'n' (|FB| = 2) y retorna la nueva raíz del subárbol."""
         # Desbalance a la izquierda (LL o LR)
         if fb < -1:
             fb_izq = self.fb_estatico(n.izq)
             if fb_izq <= 0:
-                self._log.append(
-                    f"Desbalance en {n.clave} (FB={fb}). Patrón LL → Rotación simple a la derecha en {n.clave}."
-                )
+                if self._log is not None:
+                    self._log.append((Evento.LL, n.clave, fb, None))
+                if self._metricas is not None:
+                    self._metricas.rotaciones["LL"] += 1
                 return self._rotacion_der(n)  # LL
             else:
-                self._log.append(
-                    f"Desbalance en {n.clave} (FB={fb}). Patrón LR → "
-                    f"Rotación simple a la izquierda en {n.izq.clave} y luego a la derecha en {n.clave}."
-                )
+                if self._log is not None:
+                    self._log.append((Evento.LR, n.clave, fb, n.izq.clave))
+                if self._metricas is not None:
+                    self._metricas.rotaciones["LR"] += 1
                 n.izq = self._rotacion_izq(n.izq)  # primera parte (en hijo izq)
                 return self._rotacion_der(n)       # segunda parte (en nodo)
 
         # Desbalance a la derecha (RR o RL)
-        if fb > 1:
-            fb_der = self.fb_estatico(n.der)
-            if fb_der >= 0:
-                self._log.append(
-                    f"Desbalance en {n.clave} (FB={fb}). Patrón RR → Rotación simple a la izquierda en {n.clave}."
-                )
-                return self._rotacion_izq(n)  # RR
-            else:
-                self._log.append(
-                    f"Desbalance en {n.clave} (FB={fb}). Patrón RL → "
-                    f"Rotación simple a la derecha en {n.der.clave} y luego a la izquierda en {n.clave}."
-                )
-                n.der = self._rotacion_der(n.der)  # primera parte (en hijo der)
-                return self._rotacion_izq(n)       # segunda parte (en nodo)
+        fb_der = self.fb_estatico(n.der)
+        if fb_der >= 0:
+            if self._log is not None:
+                self._log.append((Evento.RR, n.clave, fb, None))
+            if self._metricas is not None:
+                self._metricas.rotaciones["RR"] += 1
+            return self._rotacion_izq(n)  # RR
+        else:
+            if self._log is not None:
+                self._log.append((Evento.RL, n.clave, fb, n.der.clave))
+            if self._metricas is not None:
+                self._metricas.rotaciones["RL"] += 1
+            n.der = self._rotacion_der(n.der)  # primera parte (en hijo der)
+            return self._rotacion_izq(n)       # segunda parte (en nodo)
 
-        return n  # ya balanceado
+    def insertar_sin_balancear(self, clave: Clave) -> None:
+        """Inserta 'clave' sin reequilibrar (para mostrar estados intermedios)."""
+        if self._log is not None:
+            self._log.clear()
+        valor = None
+        if self._key is not None:
+            clave, valor = self._key(clave), clave
+        self.raiz = self._insertar_sin_balancear(self.raiz, clave, valor)
 
-    def _insertar_sin_balancear(self, n: Optional[Nodo], clave: int) -> Nodo:
+    def _insertar_sin_balancear(self, n: Optional[Nodo], clave: Clave, valor: Any = None) -> Nodo:
         """Inserta sin reequilibrar (solo para mostrar estados intermedios)."""
         if n is None:
-            return Nodo(clave)
+            if self._multiconjunto:
+                self._total += 1
+            return self._nodo_nuevo(clave, valor)
+        if self._persistente:
+            n = self._copiar_nodo(n)
 
         if clave < n.clave:
-            n.izq = self._insertar_sin_balancear(n.izq, clave)
+            n.izq = self._insertar_sin_balancear(n.izq, clave, valor)
         elif clave > n.clave:
-            n.der = self._insertar_sin_balancear(n.der, clave)
+            n.der = self._insertar_sin_balancear(n.der, clave, valor)
         else:
+            if self._multiconjunto:
+                n.cuenta += 1
+                self._total += 1
+                if self._con_tamanos:
+                    n.tam += 1
+                return n
             # Claves duplicadas: no insertamos
-            self._log.append(f"Clave {clave} duplicada: se ignora.")
+            if self._log is not None:
+                self._log.append((Evento.DUPLICADA, clave, 0, None))
             return n
 
         # Solo actualizar altura, sin verificar balance
         self._actualizar_altura(n)
+        if self._con_tamanos:
+            self._actualizar_tam(n)
         return n
 
+    def insertar_muchos(self, claves: Iterable[Clave]) -> int:
+        """Inserta un lote de claves y retorna cuántas eran nuevas.
+
+        El lote se ordena primero y se inserta clave por clave (O(k log n), con
+        el log de rotaciones acumulado), salvo que sea al menos 0.6 veces el
+        árbol: ahí se mezcla linealmente con el recorrido en-orden y se
+        reconstruye el árbol balanceado (O(n + k log k), sin log).
+        """
+        if self._metricas is None:
+            return self._insertar_muchos(claves)
+        inicio = time.perf_counter()
+        nuevas = self._insertar_muchos(claves)
+        self._metricas.registrar_tiempo("insertar_muchos", time.perf_counter() - inicio)
+        return nuevas
+
+    def _insertar_muchos(self, claves: Iterable[Clave]) -> int:
+        if self._log is not None:
+            self._log.clear()
+        elementos = 0
+        if self._metricas is not None:
+            claves = list(claves)  # para contar las repetidas dentro del lote
+            elementos = len(claves)
+        lote, valores, cuentas = self._lote_ordenado(claves, ordenar=True)
+        if not lote:
+            return 0
+        if valores is None:
+            valores = [None] * len(lote)
+        if cuentas is None:
+            cuentas = [1] * len(lote)
+
+        if not self._lote_grande(len(lote), _PROPORCION_RECONSTRUIR_INSERTAR):
+            # _insertar no vacía el log: los eventos de todo el lote se acumulan.
+            nuevas = 0
+            for clave, valor, cuenta in zip(lote, valores, cuentas):
+                nuevas += self._insertar_medido(clave, valor)
+                for _ in range(cuenta - 1):  # solo en multiconjunto
+                    self._insertar_medido(clave, valor)
+            if self._metricas is not None:
+                # _insertar ya contó las que estaban en el árbol; faltan las repetidas del lote.
+                self._metricas.duplicadas += elementos - sum(cuentas)
+            return nuevas
+
+        mezcla: List[Clave] = []
+        mezcla_valores: List[Any] = []
+        mezcla_cuentas: List[int] = []
+        nuevas = i = 0
+        for n in self._iter_nodos():
+            while i < len(lote) and lote[i] < n.clave:
+                mezcla.append(lote[i])
+                mezcla_valores.append(valores[i])
+                mezcla_cuentas.append(cuentas[i])
+                nuevas += 1
+                i += 1
+            cuenta = n.cuenta
+            if i < len(lote) and lote[i] == n.clave:
+                cuenta += cuentas[i]
+                i += 1
+            mezcla.append(n.clave)
+            mezcla_valores.append(n.valor)
+            mezcla_cuentas.append(cuenta)
+        nuevas += len(lote) - i
+        mezcla.extend(lote[i:])
+        mezcla_valores.extend(valores[i:])
+        mezcla_cuentas.extend(cuentas[i:])
+        self._cargar_lote(mezcla, mezcla_valores if self._con_valores else None,
+                          mezcla_cuentas if self._multiconjunto else None)
+        if self._metricas is not None:
+            self._metricas.duplicadas += elementos - nuevas
+        return nuevas
+
+    # -------- Eliminación con reequilibrado --------
+    def eliminar(self, clave: Clave) -> bool:
+        """Elimina 'clave' y reequilibra si es necesario. Retorna False si no estaba."""
+        if self._key is not None:
+            clave = self._key(clave)
+        if self._log is not None:
+            self._log.clear()
+        return self._eliminar_medido(clave)
+
+    def _eliminar_medido(self, clave: Clave) -> bool:
+        """_eliminar, registrando su duración si hay métricas."""
+        if self._metricas is None:
+            return self._eliminar(clave)
+        inicio = time.perf_counter()
+        eliminada = self._eliminar(clave)
+        self._metricas.registrar_tiempo("eliminar", time.perf_counter() - inicio)
+        return eliminada
+
+    def eliminar_muchos(self, claves: Iterable[Clave]) -> int:
+        """Elimina un lote de claves y retorna cuántas estaban en el árbol.
+
+        Se elimina clave por clave (O(k log n)) salvo que el lote sea al menos
+        la mitad del árbol: ahí conviene recorrerlo una vez, filtrar las claves
+        y reconstruirlo balanceado (O(n + k log k)).
+        """
+        if self._metricas is None:
+            return self._eliminar_muchos(claves)
+        inicio = time.perf_counter()
+        eliminadas = self._eliminar_muchos(claves)
+        self._metricas.registrar_tiempo("eliminar_muchos", time.perf_counter() - inicio)
+        return eliminadas
+
+    def _eliminar_muchos(self, claves: Iterable[Clave]) -> int:
+        if self._log is not None:
+            self._log.clear()
+        if self._key is not None:
+            claves = map(self._key, claves)
+        if self._multiconjunto:
+            # Cada aparición en el lote descuenta una ocurrencia: no se agrupa ni se reconstruye.
+            return sum(1 for clave in claves if self._eliminar_medido(clave))
+        lote = self._sin_duplicados_consecutivos(sorted(claves))
+        if not lote or self.raiz is None:
+            return 0
+
+        if not self._lote_grande(len(lote), _PROPORCION_RECONSTRUIR_ELIMINAR):
+            return sum(1 for clave in lote if self._eliminar_medido(clave))
+
+        quedan: List[Clave] = []
+        quedan_valores: List[Any] = []
+        eliminadas = j = 0
+        for n in self._iter_nodos():
+            while j < len(lote) and lote[j] < n.clave:
+                j += 1
+            if j < len(lote) and lote[j] == n.clave:
+                eliminadas += 1
+            else:
+                quedan.append(n.clave)
+                quedan_valores.append(n.valor)
+        self.raiz = self._construir_balanceado(quedan, 0, len(quedan),
+                                               quedan_valores if self._con_valores else None)
+        return eliminadas
+
+    def _lote_grande(self, k: int, proporcion: float) -> bool:
+        """True si un lote de k claves es al menos 'proporcion' de los nodos del árbol.
+
+        Sin con_tamanos los nodos se cuentan en orden, cortando apenas superan
+        k / proporcion: el costo es O(k), no O(n).
+        """
+        if self.raiz is None:
+            return True
+        limite = int(k / proporcion)
+        if self._con_tamanos:
+            return self.raiz.tam <= limite
+        return sum(1 for _ in islice(self._iter_nodos(), limite + 1)) <= limite
+
+    def _eliminar(self, clave: Clave) -> bool:
+        camino: List[Nodo] = []
+        n = self.raiz
+        while n is not None:
+            if clave < n.clave:
+                camino.append(n)
+                n = n.izq
+            elif clave > n.clave:
+                camino.append(n)
+                n = n.der
+            else:
+                break
+        if n is None:
+            if self._log is not None:
+                self._log.append((Evento.NO_ENCONTRADA, clave, 0, None))
+            return False
+        if n.cuenta > 1:
+            # Multiconjunto con más de una ocurrencia: se descuenta sin tocar la forma.
+            camino.append(n)
+            self._sumar_ocurrencia(camino, -1)
+            return True
+        if self._multiconjunto:
+            self._total -= 1
+
+        con_sucesor = -1
+        if n.izq is not None and n.der is not None:
+            # Dos hijos: se copia el sucesor (mínimo del subárbol derecho) y se elimina éste.
+            con_sucesor = len(camino)
+            camino.append(n)
+            sucesor = n.der
+            while sucesor.izq is not None:
+                camino.append(sucesor)
+                sucesor = sucesor.izq
+            n = sucesor
+        if self._persistente and camino:
+            camino = self._copiar_camino(camino)
+        if con_sucesor >= 0:
+            camino[con_sucesor].clave = n.clave
+            if self._con_valores:
+                camino[con_sucesor].valor = n.valor
+            if self._multiconjunto:
+                camino[con_sucesor].cuenta = n.cuenta
+
+        if self._con_tamanos:
+            # Hasta el nodo eliminado se pierde 1 ocurrencia; debajo de él, el
+            # sucesor entero (que subió con todas sus ocurrencias).
+            for k, m in enumerate(camino):
+                m.tam -= 1 if k <= con_sucesor else n.cuenta
+
+        reemplazo = n.izq if n.izq is not None else n.der
+        if not camino:
+            self.raiz = reemplazo
+            return True
+        padre = camino[-1]
+        if padre.izq is n:
+            padre.izq = reemplazo
+        else:
+            padre.der = reemplazo
+
+        for i in range(len(camino) - 1, -1, -1):
+            n = camino[i]
+            izq, der = n.izq, n.der
+            h_izq = izq.altura if izq is not None else 0
+            h_der = der.altura if der is not None else 0
+            altura_previa = n.altura
+            n.altura = 1 + (h_izq if h_izq > h_der else h_der)
+
+            fb = h_der - h_izq
+            if -1 <= fb <= 1:
+                if n.altura == altura_previa:
+                    break  # la altura no cambió: los ancestros no se ven afectados
+                continue
+
+            # A diferencia de la inserción, puede hacer falta rotar en varios niveles.
+            if self._persistente:
+                self._copiar_para_rotar(n, fb)
+            n = self._reequilibrar(n, fb)
+            if i == 0:
+                self.raiz = n
+            elif camino[i - 1].izq is camino[i]:
+                camino[i - 1].izq = n
+            else:
+                camino[i - 1].der = n
+            if n.altura == altura_previa:
+                break
+        return True
+
+    # -------- Unión y división (join / split) y operaciones de conjuntos --------
+    # Estas operaciones reutilizan los nodos de los árboles de entrada, que
+    # quedan vacíos. Ninguna registra eventos en el log.
+    def _arbol_vacio_similar(self) -> "AVLTree":
+        return type(self)(con_tamanos=self._con_tamanos, registrar_log=self._log is not None, key=self._key,
+                          con_valores=self._con_valores)
+
+    def _exigir_no_persistente(self) -> None:
+        if self._persistente:
+            raise RuntimeError("unir/dividir y las operaciones de conjuntos no están disponibles en modo persistente.")
+
+    def _exigir_no_multiconjunto(self) -> None:
+        if self._multiconjunto:
+            raise RuntimeError("unir/dividir y las operaciones de conjuntos no están disponibles en modo multiconjunto.")
+
+    def _exigir_compatible(self, otro: "AVLTree") -> None:
+        self._exigir_no_persistente()
+        otro._exigir_no_persistente()
+        self._exigir_no_multiconjunto()
+        otro._exigir_no_multiconjunto()
+        if (self._con_tamanos != otro._con_tamanos or self._key is not otro._key
+                or self._con_valores != otro._con_valores):
+            raise ValueError("Los árboles deben tener la misma configuración (con_tamanos, key, con_valores).")
+
+    @classmethod
+    def unir(cls, t1: "AVLTree", clave: Clave, t2: "AVLTree", valor: Any = None) -> "AVLTree":
+        """Une t1, 'clave' y t2 (todas las claves de t1 < clave < todas las de t2) en O(|h1 - h2| + 1).
+
+        t1 y t2 quedan vacíos. 'valor' es el valor del nodo de 'clave'; con
+        key=, 'clave' es un elemento y el nodo lo guarda como valor.
+        """
+        t1._exigir_compatible(t2)
+        if t1._key is not None:
+            if valor is not None:
+                raise RuntimeError("Con key= el nodo guarda su elemento: unir no recibe 'valor'.")
+            clave, valor = t1._key(clave), clave
+        elif valor is not None and not t1._con_valores:
+            raise RuntimeError("unir con 'valor' requiere AVLTree(con_valores=True).")
+        max_t1, min_t2 = t1.maximo(), t2.minimo()
+        if (max_t1 is not None and not max_t1 < clave) or (min_t2 is not None and not clave < min_t2):
+            raise ValueError("unir requiere claves(t1) < clave < claves(t2).")
+        resultado = t1._arbol_vacio_similar()
+        resultado.raiz = resultado._unir_nodos(t1.raiz, resultado._nodo_nuevo(clave, valor), t2.raiz)
+        t1.raiz = t2.raiz = None
+        return resultado
+
+    def dividir(self, clave: Clave) -> Tuple["AVLTree", "AVLTree"]:
+        """Divide el árbol en (claves < 'clave', claves > 'clave') en O(log n).
+
+        'clave' (si estaba) se descarta y este árbol queda vacío.
+        """
+        self._exigir_no_persistente()
+        self._exigir_no_multiconjunto()
+        if self._key is not None:
+            clave = self._key(clave)
+        izq, _, der = self._dividir(self.raiz, clave)
+        self.raiz = None
+        menores, mayores = self._arbol_vacio_similar(), self._arbol_vacio_similar()
+        menores.raiz, mayores.raiz = izq, der
+        return menores, mayores
+
+    def union(self, otro: "AVLTree") -> None:
+        """Agrega a este árbol las claves de 'otro' (que queda vacío). O(m log(n/m + 1)).
+
+        Si una clave está en ambos, se conserva el nodo (y el valor) de este árbol.
+        """
+        self._exigir_compatible(otro)
+        self.raiz = self._union(self.raiz, otro.raiz)
+        otro.raiz = None
+
+    def interseccion(self, otro: "AVLTree") -> None:
+        """Deja en este árbol solo las claves que también están en 'otro' (que queda vacío)."""
+        self._exigir_compatible(otro)
+        self.raiz = self._interseccion(self.raiz, otro.raiz)
+        otro.raiz = None
+
+    def diferencia(self, otro: "AVLTree") -> None:
+        """Quita de este árbol las claves que están en 'otro' (que queda vacío)."""
+        self._exigir_compatible(otro)
+        self.raiz = self._diferencia(self.raiz, otro.raiz)
+        otro.raiz = None
+
+    def _enlazar(self, n: Nodo, izq: Optional[Nodo], der: Optional[Nodo]) -> Nodo:
+        """Cuelga 'izq' y 'der' de 'n' y recalcula su altura (y tamaño)."""
+        n.izq, n.der = izq, der
+        h_izq = izq.altura if izq is not None else 0
+        h_der = der.altura if der is not None else 0
+        n.altura = 1 + (h_izq if h_izq > h_der else h_der)
+        if self._con_tamanos:
+            self._actualizar_tam(n)
+        return n
+
+    def _unir_nodos(self, izq: Optional[Nodo], m: Nodo, der: Optional[Nodo]) -> Nodo:
+        """Join: retorna un AVL con izq < m < der, bajando por el lado del subárbol más alto."""
+        h_izq, h_der = self.altura(izq), self.altura(der)
+        if h_izq > h_der + 1:
+            return self._unir_por_derecha(izq, m, der)
+        if h_der > h_izq + 1:
+            return self._unir_por_izquierda(izq, m, der)
+        return self._enlazar(m, izq, der)
+
+    def _unir_por_derecha(self, izq: Nodo, m: Nodo, der: Optional[Nodo]) -> Nodo:
+        c = izq.der
+        if self.altura(c) <= self.altura(der) + 1:
+            nuevo = self._enlazar(m, c, der)
+            if nuevo.altura <= self.altura(izq.izq) + 1:
+                return self._enlazar(izq, izq.izq, nuevo)
+            return self._rotacion_izq(self._enlazar(izq, izq.izq, self._rotacion_der(nuevo)))
+        nuevo = self._unir_por_derecha(c, m, der)
+        self._enlazar(izq, izq.izq, nuevo)
+        if nuevo.altura <= self.altura(izq.izq) + 1:
+            return izq
+        return self._rotacion_izq(izq)
+
+    def _unir_por_izquierda(self, izq: Optional[Nodo], m: Nodo, der: Nodo) -> Nodo:
+        c = der.izq
+        if self.altura(c) <= self.altura(izq) + 1:
+            nuevo = self._enlazar(m, izq, c)
+            if nuevo.altura <= self.altura(der.der) + 1:
+                return self._enlazar(der, nuevo, der.der)
+            return self._rotacion_der(self._enlazar(der, self._rotacion_izq(nuevo), der.der))
+        nuevo = self._unir_por_izquierda(izq, m, c)
+        self._enlazar(der, nuevo, der.der)
+        if nuevo.altura <= self.altura(der.der) + 1:
+            return der
+        return self._rotacion_der(der)
+
+    def _unir_sin_clave(self, izq: Optional[Nodo], der: Optional[Nodo]) -> Optional[Nodo]:
+        """Join sin clave intermedia: usa el máximo de 'izq' como pivote."""
+        if izq is None:
+            return der
+        resto, maximo = self._separar_maximo(izq)
+        return self._unir_nodos(resto, maximo, der)
+
+    def _separar_maximo(self, n: Nodo) -> Tuple[Optional[Nodo], Nodo]:
+        if n.der is None:
+            return n.izq, n
+        resto, maximo = self._separar_maximo(n.der)
+        return self._unir_nodos(n.izq, n, resto), maximo
+
+    def _dividir(self, n: Optional[Nodo], clave: Clave) -> Tuple[Optional[Nodo], Optional[Nodo], Optional[Nodo]]:
+        """Split: retorna (subárbol < clave, nodo con 'clave' o None, subárbol > clave)."""
+        if n is None:
+            return None, None, None
+        if clave < n.clave:
+            izq, encontrado, der = self._dividir(n.izq, clave)
+            return izq, encontrado, self._unir_nodos(der, n, n.der)
+        if clave > n.clave:
+            izq, encontrado, der = self._dividir(n.der, clave)
+            return self._unir_nodos(n.izq, n, izq), encontrado, der
+        return n.izq, n, n.der
+
+    def _union(self, a: Optional[Nodo], b: Optional[Nodo]) -> Optional[Nodo]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        a_izq, a_der = a.izq, a.der
+        b_izq, _, b_der = self._dividir(b, a.clave)
+        return self._unir_nodos(self._union(a_izq, b_izq), a, self._union(a_der, b_der))
+
+    def _interseccion(self, a: Optional[Nodo], b: Optional[Nodo]) -> Optional[Nodo]:
+        if a is None or b is None:
+            return None
+        a_izq, a_der = a.izq, a.der
+        b_izq, encontrado, b_der = self._dividir(b, a.clave)
+        izq = self._interseccion(a_izq, b_izq)
+        der = self._interseccion(a_der, b_der)
+        if encontrado is not None:
+            return self._unir_nodos(izq, a, der)
+        return self._unir_sin_clave(izq, der)
+
+    def _diferencia(self, a: Optional[Nodo], b: Optional[Nodo]) -> Optional[Nodo]:
+        if a is None or b is None:
+            return a
+        b_izq, b_der = b.izq, b.der
+        a_izq, _, a_der = self._dividir(a, b.clave)
+        return self._unir_sin_clave(self._diferencia(a_izq, b_izq), self._diferencia(a_der, b_der))
+
+    # -------- Consultas --------
+    def contiene(self, clave: Clave) -> bool:
+        """True si 'clave' está en el árbol. O(log n), sin recursión ni listas intermedias."""
+        if self._key is not None:
+            clave = self._key(clave)
+        n = self.raiz
+        while n is not None:
+            if clave < n.clave:
+                n = n.izq
+            elif clave > n.clave:
+                n = n.der
+            else:
+                return True
+        return False
+
+    __contains__ = contiene
+
+    def minimo(self) -> Optional[Clave]:
+        """Menor clave del árbol, o None si está vacío."""
+        n = self.raiz
+        if n is None:
+            return None
+        while n.izq is not None:
+            n = n.izq
+        return n.clave
+
+    def maximo(self) -> Optional[Clave]:
+        """Mayor clave del árbol, o None si está vacío."""
+        n = self.raiz
+        if n is None:
+            return None
+        while n.der is not None:
+            n = n.der
+        return n.clave
+
+    def piso(self, clave: Clave) -> Optional[Clave]:
+        """Mayor clave <= 'clave', o None si no hay ninguna."""
+        if self._key is not None:
+            clave = self._key(clave)
+        n, mejor = self.raiz, None
+        while n is not None:
+            if clave < n.clave:
+                n = n.izq
+            elif clave > n.clave:
+                mejor = n.clave
+                n = n.der
+            else:
+                return n.clave
+        return mejor
+
+    def techo(self, clave: Clave) -> Optional[Clave]:
+        """Menor clave >= 'clave', o None si no hay ninguna."""
+        if self._key is not None:
+            clave = self._key(clave)
+        n, mejor = self.raiz, None
+        while n is not None:
+            if clave < n.clave:
+                mejor = n.clave
+                n = n.izq
+            elif clave > n.clave:
+                n = n.der
+            else:
+                return n.clave
+        return mejor
+
+    # -------- Uso como diccionario ordenado --------
+    def _buscar_nodo(self, clave: Clave) -> Optional[Nodo]:
+        """Nodo con 'clave' (ya derivada), o None."""
+        n = self.raiz
+        while n is not None:
+            if clave < n.clave:
+                n = n.izq
+            elif clave > n.clave:
+                n = n.der
+            else:
+                return n
+        return None
+
+    def asignar(self, clave: Clave, valor: Any) -> bool:
+        """Asocia 'valor' a 'clave', insertándola si hace falta. Retorna True si la clave era nueva.
+
+        Si la clave ya estaba, solo se reemplaza el valor (sin reestructurar;
+        en modo persistente se copia el camino hasta el nodo). Requiere
+        con_valores=True y no está disponible con key=.
+        """
+        if self._key is not None:
+            raise RuntimeError("Con key= cada nodo guarda su elemento: asignar y t[...] = v no están disponibles.")
+        if not self._con_valores:
+            raise RuntimeError("asignar y t[...] = v requieren AVLTree(con_valores=True).")
+        if self._log is not None:
+            self._log.clear()
+        camino: List[Nodo] = []
+        n = self.raiz
+        while n is not None:
+            camino.append(n)
+            if clave < n.clave:
+                n = n.izq
+            elif clave > n.clave:
+                n = n.der
+            else:
+                if self._persistente:
+                    camino = self._copiar_camino(camino)
+                camino[-1].valor = valor
+                return False
+        return self._insertar_medido(clave, valor)
+
+    def obtener(self, clave: Clave, defecto: Any = None) -> Any:
+        """Valor asociado a 'clave', o 'defecto' si no está."""
+        n = self._buscar_nodo(self._key(clave) if self._key is not None else clave)
+        return n.valor if n is not None else defecto
+
+    def __getitem__(self, clave: Clave) -> Any:
+        n = self._buscar_nodo(self._key(clave) if self._key is not None else clave)
+        if n is None:
+            raise KeyError(clave)
+        return n.valor
+
+    def __setitem__(self, clave: Clave, valor: Any) -> None:
+        self.asignar(clave, valor)
+
+    def __delitem__(self, clave: Clave) -> None:
+        if not self.eliminar(clave):
+            raise KeyError(clave)
+
+    def items(self) -> Iterator[Tuple[Clave, Any]]:
+        """Genera los pares (clave, valor) en orden de clave."""
+        for n in self._iter_nodos():
+            yield n.clave, n.valor
+
+    def valores(self) -> Iterator[Any]:
+        """Genera los valores en orden de clave (con key= y sin asignar, los elementos)."""
+        for n in self._iter_nodos():
+            yield n.valor
+
+    # -------- Multiconjunto --------
+    def _exigir_multiconjunto(self) -> None:
+        if not self._multiconjunto:
+            raise RuntimeError("Operación disponible solo en AVLTree(multiconjunto=True).")
+
+    def contar(self, clave: Clave) -> int:
+        """Ocurrencias de 'clave' (0 si no está), en O(log n)."""
+        self._exigir_multiconjunto()
+        n = self._buscar_nodo(clave)
+        return n.cuenta if n is not None else 0
+
+    def total(self) -> int:
+        """Cantidad total de ocurrencias (contando repetidas), en O(1)."""
+        self._exigir_multiconjunto()
+        return self._total
+
+    def conteos(self) -> Iterator[Tuple[Clave, int]]:
+        """Genera los pares (clave, ocurrencias) en orden de clave."""
+        self._exigir_multiconjunto()
+        for n in self._iter_nodos():
+            yield n.clave, n.cuenta
+
+    # -------- Estadísticos de orden (requieren con_tamanos=True) --------
+    def _exigir_tamanos(self) -> None:
+        if not self._con_tamanos:
+            raise RuntimeError("Operación disponible solo en AVLTree(con_tamanos=True).")
+
+    def rango_de(self, clave: Clave) -> int:
+        """Cantidad de claves estrictamente menores que 'clave' (su posición en el recorrido en-orden)."""
+        self._exigir_tamanos()
+        if self._key is not None:
+            clave = self._key(clave)
+        return self._contar_menores(clave, inclusive=False)
+
+    def k_esimo(self, k: int) -> Clave:
+        """Clave en la posición k (desde 0), equivalente a recorrido_inorden()[k] pero en O(log n)."""
+        self._exigir_tamanos()
+        total = self.tam(self.raiz)
+        if k < 0:
+            k += total
+        if not 0 <= k < total:
+            raise IndexError("k fuera de rango")
+        n = self.raiz
+        while True:
+            t_izq = n.izq.tam if n.izq is not None else 0
+            if k < t_izq:
+                n = n.izq
+            elif k < t_izq + n.cuenta:
+                return n.clave
+            else:
+                k -= t_izq + n.cuenta
+                n = n.der
+
+    def contar_entre(self, lo: Clave, hi: Clave) -> int:
+        """Cantidad de claves c con lo <= c <= hi."""
+        self._exigir_tamanos()
+        if self._key is not None:
+            lo, hi = self._key(lo), self._key(hi)
+        if hi < lo:
+            return 0
+        return self._contar_menores(hi, inclusive=True) - self._contar_menores(lo, inclusive=False)
+
+    def _contar_menores(self, clave: Clave, inclusive: bool) -> int:
+        """Cantidad de claves < 'clave' (o <= si inclusive)."""
+        cuenta = 0
+        n = self.raiz
+        while n is not None:
+            if clave < n.clave or (clave == n.clave and not inclusive):
+                n = n.izq
+            else:
+                cuenta += n.cuenta + (n.izq.tam if n.izq is not None else 0)
+                if clave == n.clave:
+                    return cuenta
+                n = n.der
+        return cuenta
+
     # -------- Visualización ASCII --------
-    def ascii(self, mostrar_detalles: bool = True) -> str:
+    def ascii(self, mostrar_detalles: bool = True, salida: Optional[TextIO] = None,
+              profundidad_max: Optional[int] = None) -> Optional[str]:
         """Retorna string con el árbol en ASCII.
         
         Args:
             mostrar_detalles: Si True, muestra alturas y FB. Si False, solo las claves.
+            salida: Si se pasa (un objeto tipo archivo), las líneas se escriben ahí
+                a medida que se generan y se retorna None.
+            profundidad_max: Si se indica, no baja más de esa cantidad de niveles
+                bajo la raíz (0 = solo la raíz); los nodos con descendientes
+                ocultos se marcan con "…". ValueError si es negativa.
         """
+        if profundidad_max is not None and profundidad_max < 0:
+            raise ValueError(f"profundidad_max debe ser >= 0 (se recibió {profundidad_max}).")
         if not self.raiz:
-            return "(árbol vacío)"
-        lineas: List[str] = []
-        self._render_ascii(self.raiz, "", True, lineas, mostrar_detalles)
-        return "\n".join(lineas)
+            lineas: Iterable[str] = ["(árbol vacío)"]
+        else:
+            lineas = self._lineas_ascii(mostrar_detalles, profundidad_max)
+        if salida is None:
+            return "\n".join(lineas)
+        for linea in lineas:
+            salida.write(linea)
+            salida.write("\n")
+        return None
 
-    def _render_ascii(self, n: Optional[Nodo], prefijo: str, es_izq: bool, out: List[str], mostrar_detalles: bool = True) -> None:
-        if n is None:
-            return
-        if n.der:
-            nuevo_pref = prefijo + ("│   " if es_izq else "    ")
-            self._render_ascii(n.der, nuevo_pref, False, out, mostrar_detalles)
+    def _lineas_ascii(self, mostrar_detalles: bool = True, profundidad_max: Optional[int] = None) -> Iterator[str]:
+        """Genera las líneas de ascii() con un recorrido iterativo (derecho, nodo, izquierdo).
         
-        # Elegir qué mostrar en el nodo
-        contenido_nodo = str(n) if mostrar_detalles else str(n.clave)
-        out.append(prefijo + ("└── " if es_izq else "┌── ") + contenido_nodo)
-        
-        if n.izq:
-            nuevo_pref = prefijo + ("    " if es_izq else "│   ")
-            self._render_ascii(n.izq, nuevo_pref, True, out, mostrar_detalles)
+        El prefijo de cada línea se arma con un único buffer de segmentos compartido
+        por todo el recorrido: el nodo de profundidad d fija prefijo[d - 1] y sus
+        descendientes solo tocan posiciones >= d, así que al emitirlo prefijo[:d]
+        sigue siendo el suyo.
+        """
+        prefijo: List[str] = []
+        # (nodo, profundidad, es_izq, último segmento del prefijo, ya expandido)
+        pila: List[Tuple[Nodo, int, bool, str, bool]] = [(self.raiz, 0, True, "", False)]
+        while pila:
+            n, d, es_izq, segmento, expandido = pila.pop()
+            if expandido:
+                del prefijo[d:]
+                contenido_nodo = str(n) if mostrar_detalles else str(n.clave)
+                if profundidad_max is not None and d == profundidad_max and (n.izq or n.der):
+                    contenido_nodo += " …"
+                yield "".join(prefijo) + ("└── " if es_izq else "┌── ") + contenido_nodo
+                continue
+            if d > 0:
+                del prefijo[d - 1:]
+                prefijo.append(segmento)
+            baja = profundidad_max is None or d < profundidad_max
+            if n.izq and baja:
+                pila.append((n.izq, d + 1, True, "    " if es_izq else "│   ", False))
+            pila.append((n, d, es_izq, segmento, True))
+            if n.der and baja:
+                pila.append((n.der, d + 1, False, "│   " if es_izq else "    ", False))
 
-    def ascii_simple(self) -> str:
+    def ascii_simple(self, salida: Optional[TextIO] = None, profundidad_max: Optional[int] = None) -> Optional[str]:
         """Retorna string con el árbol en ASCII mostrando solo las claves."""
-        return self.ascii(mostrar_detalles=False)
-    
-    def arbol_tradicional(self) -> str:
-        """Retorna string con el árbol en formato tradicional usando / y \\."""
-        if not self.raiz:
-            return "(árbol vacío)"
+        return self.ascii(mostrar_detalles=False, salida=salida, profundidad_max=profundidad_max)
+
+    def arbol_tradicional(self, salida: Optional[TextIO] = None) -> Optional[str]:
+        """Retorna string con el árbol en formato tradicional usando / y \\.
         
-        # Construir el árbol por niveles
-        lineas = self._construir_arbol_con_ramas(self.raiz)
-        return "\n".join(lineas) if lineas else ""
+        Si se pasa 'salida' (un objeto tipo archivo), las filas se escriben ahí
+        a medida que se generan y se retorna None, sin armar el texto completo.
+        """
+        lineas = self._lineas_tradicional() if self.raiz else iter(["(árbol vacío)"])
+        if salida is None:
+            return "\n".join(lineas)
+        for linea in lineas:
+            salida.write(linea)
+            salida.write("\n")
+        return None
     
-    def _construir_arbol_con_ramas(self, nodo: Optional[Nodo]) -> List[str]:
-        """Construye el árbol con formato de ramas / y \\."""
-        if not nodo:
-            return []
+    def _anchos_tradicional(self) -> Dict[int, int]:
+        """Ancho en columnas de cada subárbol (id(nodo) -> ancho), calculado de abajo hacia arriba.
         
-        # Para árboles simples, usar un enfoque directo
-        return self._arbol_con_ramas_recursivo(nodo, 0)
+        Cada subárbol ocupa el ancho de su izquierdo, su clave y su derecho, más
+        una columna de separación por cada hijo (donde va la / o la \\).
+        """
+        anchos: Dict[int, int] = {}
+        pila: List[Tuple[Nodo, bool]] = [(self.raiz, False)]
+        while pila:
+            n, hijos_listos = pila.pop()
+            if not hijos_listos:
+                pila.append((n, True))
+                if n.der is not None:
+                    pila.append((n.der, False))
+                if n.izq is not None:
+                    pila.append((n.izq, False))
+                continue
+            ancho = len(str(n.clave))
+            if n.izq is not None:
+                ancho += anchos[id(n.izq)] + 1
+            if n.der is not None:
+                ancho += anchos[id(n.der)] + 1
+            anchos[id(n)] = ancho
+        return anchos
     
-    def _arbol_con_ramas_recursivo(self, nodo: Optional[Nodo], nivel: int) -> List[str]:
-        """Construye recursivamente el árbol con ramas."""
-        if not nodo:
-            return []
-        
-        # Si es una hoja
-        if not nodo.izq and not nodo.der:
-            return [str(nodo.clave)]
-        
-        valor = str(nodo.clave)
-        resultado = []
-        
-        # Obtener subárboles
-        sub_izq = self._arbol_con_ramas_recursivo(nodo.izq, nivel + 1)
-        sub_der = self._arbol_con_ramas_recursivo(nodo.der, nivel + 1)
-        
-        # Calcular anchos
-        ancho_izq = max(len(linea.rstrip()) for linea in sub_izq) if sub_izq else 0
-        ancho_der = max(len(linea) for linea in sub_der) if sub_der else 0
+    def _lineas_tradicional(self) -> Iterator[str]:
+        """Genera las filas del formato tradicional, nivel por nivel.
         
-        # Posición del valor
-        pos_valor = ancho_izq + 1
-        
-        # Línea del nodo
-        if sub_izq and sub_der:
-            # Ambos hijos
-            linea_nodo = " " * ancho_izq + valor
-            resultado.append(linea_nodo)
-            
-            # Línea de conexiones
-            linea_conexiones = " " * (ancho_izq - 1) + "/" + " " + "\\"
-            resultado.append(linea_conexiones)
-            
-        elif sub_izq:
-            # Solo hijo izquierdo
-            linea_nodo = " " * ancho_izq + valor
-            resultado.append(linea_nodo)
-            linea_conexion = " " * (ancho_izq - 1) + "/"
-            resultado.append(linea_conexion)
-            
-        elif sub_der:
-            # Solo hijo derecho
-            linea_nodo = valor + "\\"
-            resultado.append(linea_nodo)
-            linea_conexion = " " * len(valor) + "\\"
-            resultado.append(linea_conexion)
-        
-        # Combinar subárboles
-        max_lineas = max(len(sub_izq), len(sub_der))
-        
-        for i in range(max_lineas):
-            linea_izq = sub_izq[i] if i < len(sub_izq) else " " * ancho_izq
-            linea_der = sub_der[i] if i < len(sub_der) else ""
-            
-            if sub_izq and sub_der:
-                linea_completa = linea_izq + " " + linea_der
-            elif sub_izq:
-                linea_completa = linea_izq
-            else:
-                linea_completa = " " * (len(valor) + 1) + linea_der
-                
-            resultado.append(linea_completa)
-        
-        return resultado
+        Con los anchos ya calculados, la columna de cada nodo sale de la de su
+        padre en O(1); cada fila se arma con los tramos (espacios + texto) de los
+        nodos de ese nivel, de izquierda a derecha, sin retocar filas anteriores.
+        Cada / queda sobre el último carácter de la clave del hijo izquierdo y
+        cada \\ sobre el primero de la del derecho.
+        """
+        anchos = self._anchos_tradicional()
+
+        def columna_clave(n: Nodo, x: int) -> int:
+            """Columna donde empieza la clave de 'n' si su subárbol empieza en 'x'."""
+            return x + anchos[id(n.izq)] + 1 if n.izq is not None else x
+
+        nivel: List[Tuple[Nodo, int]] = [(self.raiz, 0)]  # (nodo, columna de inicio del subárbol)
+        while nivel:
+            fila_claves: List[str] = []
+            fila_ramas: List[str] = []
+            col_claves = col_ramas = 0
+            siguiente: List[Tuple[Nodo, int]] = []
+            for n, x in nivel:
+                valor = str(n.clave)
+                col = columna_clave(n, x)
+                if n.izq is not None:
+                    rama = columna_clave(n.izq, x) + len(str(n.izq.clave)) - 1
+                    fila_ramas.append(" " * (rama - col_ramas) + "/")
+                    col_ramas = rama + 1
+                    siguiente.append((n.izq, x))
+                fila_claves.append(" " * (col - col_claves) + valor)
+                col += len(valor)
+                col_claves = col
+                if n.der is not None:
+                    rama = columna_clave(n.der, col + 1)
+                    fila_ramas.append(" " * (rama - col_ramas) + "\\")
+                    col_ramas = rama + 1
+                    siguiente.append((n.der, col + 1))
+            yield "".join(fila_claves)
+            if fila_ramas:
+                yield "".join(fila_ramas)
+            nivel = siguiente
+
+    # -------- Métricas (requieren metricas=True) --------
+    def _exigir_metricas(self) -> MetricasAVL:
+        if self._metricas is None:
+            raise RuntimeError("Métricas disponibles solo en AVLTree(metricas=True).")
+        return self._metricas
+
+    def metricas(self) -> Dict[str, object]:
+        """Instantánea de las métricas acumuladas (ver MetricasAVL.instantanea)."""
+        return self._exigir_metricas().instantanea()
+
+    def metricas_json(self, indent: Optional[int] = 2) -> str:
+        """La misma instantánea que metricas(), serializada en JSON."""
+        return json.dumps(self.metricas(), indent=indent)
+
+    def reiniciar_metricas(self) -> None:
+        """Pone en cero contadores, histograma y tiempos."""
+        self._exigir_metricas().reiniciar()
 
     # -------- Utilitarios --------
     def consumir_log(self) -> List[str]:
-        logs = list(self._log)
+        """Retorna (y vacía) los mensajes de la última operación."""
+        return [formatear_evento(e) for e in self.consumir_eventos()]
+
+    def consumir_eventos(self) -> List[RegistroEvento]:
+        """Retorna (y vacía) los eventos de la última operación, sin formatear."""
+        if not self._log:
+            return []
+        eventos = list(self._log)
         self._log.clear()
-        return logs
-
-    def recorrido_inorden(self) -> List[int]:
-        res: List[int] = []
-        def _in(n: Optional[Nodo]):
-            if not n: return
-            _in(n.izq); res.append(n.clave); _in(n.der)
-        _in(self.raiz)
-        return res
+        return eventos
+
+    def recorrido_inorden(self) -> List[Clave]:
+        return list(self.iter_inorden())
+
+    def iter_inorden(self) -> Iterator[Clave]:
+        """Genera las claves en orden creciente, de a una (pila explícita, memoria O(h))."""
+        pila: List[Nodo] = []
+        n = self.raiz
+        while pila or n is not None:
+            while n is not None:
+                pila.append(n)
+                n = n.izq
+            n = pila.pop()
+            yield n.clave
+            n = n.der
+
+    __iter__ = iter_inorden
+
+    def _iter_nodos(self) -> Iterator[Nodo]:
+        """Como iter_inorden, pero genera los nodos (para acceder a clave y valor)."""
+        pila: List[Nodo] = []
+        n = self.raiz
+        while pila or n is not None:
+            while n is not None:
+                pila.append(n)
+                n = n.izq
+            n = pila.pop()
+            yield n
+            n = n.der
+
+    def iter_inorden_inverso(self) -> Iterator[Clave]:
+        """Genera las claves en orden decreciente."""
+        pila: List[Nodo] = []
+        n = self.raiz
+        while pila or n is not None:
+            while n is not None:
+                pila.append(n)
+                n = n.der
+            n = pila.pop()
+            yield n.clave
+            n = n.izq
+
+    def rango(self, lo: Clave, hi: Clave) -> Iterator[Clave]:
+        """Genera en orden las claves c con lo <= c <= hi, en O(log n + k)."""
+        if self._key is not None:
+            lo, hi = self._key(lo), self._key(hi)
+        pila: List[Nodo] = []
+        n = self.raiz
+        # Descenso inicial: se apilan solo los nodos >= lo (los menores se saltean por la derecha).
+        while n is not None:
+            if n.clave < lo:
+                n = n.der
+            else:
+                pila.append(n)
+                n = n.izq
+        while pila:
+            n = pila.pop()
+            if n.clave > hi:
+                return
+            yield n.clave
+            n = n.der
+            while n is not None:
+                pila.append(n)
+                n = n.izq
 
 
 def escribir_lento(texto: str, velocidad: float = 0.03) -> None: